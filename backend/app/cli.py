@@ -0,0 +1,220 @@
+"""
+ATS Resume Analyzer - Offline bulk analysis CLI
+
+Analyzes a directory (or file list) of resumes across a process pool and
+streams one JSON line per resume.
+
+Usage:
+    python -m app.cli resumes/ -o results.jsonl
+    python -m app.cli --file-list paths.txt --workers 8 --chunk-size 16
+    python -m app.cli resumes/ -o results.jsonl --resume   # skip finished files
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from app.services.worker_pool import analyze_in_worker, available_cpus, init_worker
+
+ALLOWED_EXTENSIONS = {".pdf", ".docx"}
+
+
+def iter_resume_paths(inputs: List[str], file_list: Optional[str]) -> Iterator[str]:
+    """Yield resume paths from directories/files and an optional list file"""
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, dirs, files in os.walk(item):
+                dirs.sort()
+                for name in sorted(files):
+                    if os.path.splitext(name)[1].lower() in ALLOWED_EXTENSIONS:
+                        yield os.path.join(root, name)
+        else:
+            yield item
+
+    if file_list:
+        stream = sys.stdin if file_list == "-" else open(file_list, encoding="utf-8")
+        try:
+            for line in stream:
+                path = line.strip()
+                if path:
+                    yield path
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+def load_checkpoint(output_path: str) -> Set[str]:
+    """
+    Read paths already written to an output file
+
+    A trailing partial line left by a crash is truncated so the file stays
+    valid JSONL when appending resumes.
+    """
+    done: Set[str] = set()
+    if not os.path.exists(output_path):
+        return done
+
+    valid_bytes = 0
+    with open(output_path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            done.add(record["path"])
+            valid_bytes += len(line)
+
+    if valid_bytes < os.path.getsize(output_path):
+        with open(output_path, "r+b") as f:
+            f.truncate(valid_bytes)
+    return done
+
+
+def analyze_path(path: str) -> Dict[str, Any]:
+    """Analyze one file in a worker process and return its JSONL record"""
+    started = time.perf_counter()
+    record: Dict[str, Any] = {"path": path}
+    try:
+        file_ext = os.path.splitext(path)[1].lower()
+        if file_ext not in ALLOWED_EXTENSIONS:
+            raise ValueError(f"Unsupported file type: {file_ext or 'none'}")
+        with open(path, "rb") as f:
+            content = f.read()
+        response = analyze_in_worker(content, file_ext)
+        record["success"] = True
+        record["result"] = response.model_dump(mode="json")
+    except Exception as e:
+        record["success"] = False
+        record["error"] = str(e)
+    record["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return record
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def run(
+    paths: Iterable[str],
+    output,
+    workers: int,
+    chunk_size: int,
+    skip: Set[str]
+) -> Dict[str, Any]:
+    """Analyze all paths, writing records to `output`; returns a summary"""
+    timings: List[float] = []
+    succeeded = failed = skipped = 0
+
+    def pending_paths() -> Iterator[str]:
+        nonlocal skipped
+        for path in paths:
+            if path in skip:
+                skipped += 1
+            else:
+                yield path
+
+    pending = pending_paths()
+    started = time.perf_counter()
+
+    def write(record: Dict[str, Any]) -> None:
+        nonlocal succeeded, failed
+        output.write(json.dumps(record) + "\n")
+        output.flush()
+        timings.append(record["elapsed_ms"])
+        if record["success"]:
+            succeeded += 1
+        else:
+            failed += 1
+
+    if workers <= 0:
+        init_worker()
+        for path in pending:
+            write(analyze_path(path))
+    else:
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(workers, initializer=init_worker) as pool:
+            for record in pool.imap_unordered(analyze_path, pending, chunksize=chunk_size):
+                write(record)
+
+    elapsed = time.perf_counter() - started
+    timings.sort()
+    processed = succeeded + failed
+    return {
+        "processed": processed,
+        "succeeded": succeeded,
+        "failed": failed,
+        "skipped": skipped,
+        "elapsed_seconds": round(elapsed, 2),
+        "files_per_second": round(processed / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": percentile(timings, 50),
+        "p95_ms": percentile(timings, 95),
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli",
+        description="Analyze a directory of resumes and write one JSON line per file"
+    )
+    parser.add_argument("inputs", nargs="*", help="Resume files or directories (searched recursively)")
+    parser.add_argument("--file-list", help="File with one resume path per line ('-' for stdin)")
+    parser.add_argument("-o", "--output", help="Output JSONL file (default: stdout)")
+    parser.add_argument(
+        "--workers", type=int, default=available_cpus(),
+        help="Worker processes (default: available CPUs; 0 runs in-process)"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=8,
+        help="Files handed to a worker at a time (default: 8)"
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Skip files already present in --output and append to it"
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if not args.inputs and not args.file_list:
+        print("error: give at least one input path or --file-list", file=sys.stderr)
+        return 2
+    if args.resume and not args.output:
+        print("error: --resume requires --output", file=sys.stderr)
+        return 2
+
+    skip = load_checkpoint(args.output) if args.resume else set()
+    paths = iter_resume_paths(args.inputs, args.file_list)
+
+    if args.output:
+        output = open(args.output, "a" if args.resume else "w", encoding="utf-8")
+    else:
+        output = sys.stdout
+    try:
+        summary = run(paths, output, args.workers, max(1, args.chunk_size), skip)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(
+        f"Processed {summary['processed']} files "
+        f"({summary['succeeded']} ok, {summary['failed']} failed, "
+        f"{summary['skipped']} skipped) in {summary['elapsed_seconds']}s - "
+        f"{summary['files_per_second']} files/sec, "
+        f"p50 {summary['p50_ms']}ms, p95 {summary['p95_ms']}ms per file",
+        file=sys.stderr
+    )
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
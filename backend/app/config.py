@@ -0,0 +1,92 @@
+"""
+Runtime configuration - deploy-time settings read from environment variables
+"""
+import os
+import tempfile
+from typing import Optional
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+def _env_optional_int(name: str) -> Optional[int]:
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return None
+    return int(value)
+
+
+def _env_str(name: str, default: Optional[str] = None) -> Optional[str]:
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip()
+
+
+# In-memory analysis result cache (set the size to 0 to disable)
+ANALYSIS_CACHE_MAX_MB = _env_int("ANALYSIS_CACHE_MAX_MB", 64)
+ANALYSIS_CACHE_TTL_SECONDS = _env_int("ANALYSIS_CACHE_TTL_SECONDS", 3600)
+
+# Persistent analysis cache shared by all workers on a node (unset to disable)
+ANALYSIS_CACHE_DIR = _env_str("ANALYSIS_CACHE_DIR")
+ANALYSIS_CACHE_DISK_MAX_MB = _env_int("ANALYSIS_CACHE_DISK_MAX_MB", 512)
+ANALYSIS_CACHE_DISK_TTL_SECONDS = _env_int("ANALYSIS_CACHE_DISK_TTL_SECONDS", 86400)
+
+# Analysis process pool: unset = one worker per available CPU (cgroup-aware),
+# 0 = run in a thread instead of worker processes
+ANALYSIS_WORKERS = _env_optional_int("ANALYSIS_WORKERS")
+ANALYSIS_QUEUE_DEPTH = _env_int("ANALYSIS_QUEUE_DEPTH", 16)
+
+# OCR pages rasterized/recognized in parallel per process: unset = one per
+# available CPU (up to the 5-page OCR limit), 1 = sequential
+OCR_PAGE_WORKERS = _env_optional_int("OCR_PAGE_WORKERS")
+# Page rasterization memory ceiling per OCR request (0 = unlimited); fewer
+# pages are rendered at once, or at a lower DPI, to stay below it
+OCR_MAX_MEMORY_MB = _env_int("OCR_MAX_MEMORY_MB", 128)
+
+# OCR admission control, shared by all analysis workers of a server:
+# concurrent OCR runs (unset = half the available CPUs), runs allowed to
+# wait for a slot and for how long. When none is free, OCR_BUSY_MODE
+# "reject" answers 503 + Retry-After; "degrade" returns the standard
+# text with parsing_method="ocr_unavailable".
+OCR_MAX_CONCURRENT = _env_optional_int("OCR_MAX_CONCURRENT")
+OCR_QUEUE_DEPTH = _env_int("OCR_QUEUE_DEPTH", 4)
+OCR_QUEUE_TIMEOUT_SECONDS = _env_int("OCR_QUEUE_TIMEOUT_SECONDS", 10)
+OCR_BUSY_MODE = _env_str("OCR_BUSY_MODE", "reject")
+
+# OCR results remembered per worker, keyed by a hash of the page image
+# (0 disables the page cache)
+OCR_PAGE_CACHE_ENTRIES = _env_int("OCR_PAGE_CACHE_ENTRIES", 256)
+
+# OCR image preprocessing: "pil" (contrast + sharpen filter chain) or
+# "numpy" (needs NumPy) with OCR_BINARIZE "otsu" | "adaptive" | "none"
+# and OCR_DESKEW=1 to straighten slightly rotated scans
+OCR_PREPROCESS = _env_str("OCR_PREPROCESS", "pil")
+OCR_BINARIZE = _env_str("OCR_BINARIZE", "otsu")
+OCR_DESKEW = _env_int("OCR_DESKEW", 0)
+
+# Stop OCR of a fully scanned PDF once the pages read so far hold a
+# confident resume with contact details and its main sections (0 = off)
+OCR_EARLY_STOP = _env_int("OCR_EARLY_STOP", 1)
+
+# Start OCR of page 1 when it is structurally scanned (shows no text) while
+# the other pages' text is still being extracted; cancelled if the text
+# turns out to be enough (0 = off)
+OCR_SPECULATIVE = _env_int("OCR_SPECULATIVE", 1)
+
+# Tesseract backend: "pytesseract" (a tesseract process per page) or
+# "tesserocr" (engine kept loaded per worker; needs tesserocr)
+OCR_ENGINE = _env_str("OCR_ENGINE", "pytesseract")
+
+# Asynchronous jobs (/api/jobs): durable SQLite queue and background runners
+JOBS_DB_PATH = _env_str(
+    "JOBS_DB_PATH", os.path.join(tempfile.gettempdir(), "ats_jobs.sqlite3")
+)
+# Unset = one runner per analysis worker
+JOBS_CONCURRENCY = _env_optional_int("JOBS_CONCURRENCY")
+JOBS_MAX_QUEUED = _env_int("JOBS_MAX_QUEUED", 1000)
+JOBS_RETENTION_SECONDS = _env_int("JOBS_RETENTION_SECONDS", 86400)
@@ -1,19 +1,32 @@
 """
 ATS Resume Analyzer - FastAPI Backend
 """
-from fastapi import FastAPI, UploadFile, File, HTTPException, Request
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Query
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+import asyncio
+import json
 import os
-import tempfile
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from app.services.resume_parser import ResumeParser
 from app.services.ats_scorer import ATSScorer
 from app.services.skill_extractor import SkillExtractor
 from app.services.domain_classifier import DomainClassifier
 from app.services.report_generator import ReportGenerator
-from app.models.schemas import AnalysisResponse
+from app.services.upload_ingest import UploadIngest, UploadRejected, UploadSizeLimit
+from app.services.analysis_pipeline import AnalysisPipeline, STAGE_COMPLETE, replay_stages
+from app.services.analysis_cache import AnalysisCache, cache_key
+from app.services.persistent_cache import SQLiteAnalysisCache
+from app.services.worker_pool import AnalysisWorkerPool, PoolBusyError
+from app.services.job_queue import JobQueueFullError, JobRunner, JobStore
+from app.services.ocr_service import OCRBusyError, ocr_service
+from app import config
+from app.models.schemas import (
+    AnalysisResponse, BatchAnalysisItem, BatchAnalysisResponse, JobStatus
+)
 
 app = FastAPI(
     title="ATS Resume Analyzer",
@@ -36,10 +49,80 @@ ats_scorer = ATSScorer()
 skill_extractor = SkillExtractor()
 domain_classifier = DomainClassifier()
 report_generator = ReportGenerator()
+analysis_pipeline = AnalysisPipeline(
+    resume_parser, skill_extractor, domain_classifier, ats_scorer
+)
+analysis_cache = AnalysisCache(
+    max_bytes=config.ANALYSIS_CACHE_MAX_MB * 1024 * 1024,
+    ttl_seconds=config.ANALYSIS_CACHE_TTL_SECONDS,
+    backend=SQLiteAnalysisCache(
+        config.ANALYSIS_CACHE_DIR,
+        max_bytes=config.ANALYSIS_CACHE_DISK_MAX_MB * 1024 * 1024,
+        ttl_seconds=config.ANALYSIS_CACHE_DISK_TTL_SECONDS
+    ) if config.ANALYSIS_CACHE_DIR else None
+)
+analysis_pool = AnalysisWorkerPool(
+    workers=config.ANALYSIS_WORKERS,
+    max_queue=config.ANALYSIS_QUEUE_DEPTH,
+    pipeline=analysis_pipeline
+)
+job_runner = JobRunner(
+    JobStore(config.JOBS_DB_PATH, retention_seconds=config.JOBS_RETENTION_SECONDS),
+    analysis_pool,
+    cache=analysis_cache,
+    concurrency=(
+        config.JOBS_CONCURRENCY if config.JOBS_CONCURRENCY is not None
+        else analysis_pool.workers
+    ),
+    max_queued=config.JOBS_MAX_QUEUED
+)
+
+# Seconds clients are told to wait before retrying when the server is busy
+BUSY_RETRY_AFTER_SECONDS = 5
 
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 ALLOWED_EXTENSIONS = {".pdf", ".docx"}
 
+# Batch uploads: per-request file count and total size limits
+MAX_BATCH_FILES = 50
+MAX_BATCH_SIZE = 50 * 1024 * 1024  # 50MB
+
+# Allowance for multipart boundaries and part headers on top of the file
+MULTIPART_OVERHEAD = 64 * 1024
+
+upload_ingest = UploadIngest(max_size=MAX_FILE_SIZE)
+
+
+def upload_limit(method: str, path: str) -> Optional[Tuple[int, str]]:
+    """
+    Request body limit of the upload endpoints, for UploadSizeLimit
+    
+    Uses the same 400 status and message as the size checks made while
+    reading the upload.
+    """
+    if method != "POST" or not (path.startswith("/api/analyze") or path == "/api/jobs"):
+        return None
+    if path == "/api/analyze/batch":
+        return (
+            MAX_BATCH_SIZE + MAX_BATCH_FILES * MULTIPART_OVERHEAD,
+            f"Batch size exceeds {MAX_BATCH_SIZE // (1024 * 1024)}MB limit"
+        )
+    return MAX_FILE_SIZE + MULTIPART_OVERHEAD, upload_ingest.size_error
+
+
+app.add_middleware(UploadSizeLimit, limit=upload_limit)
+
+
+@app.on_event("startup")
+async def start_job_runner():
+    job_runner.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_workers():
+    await job_runner.stop()
+    analysis_pool.shutdown()
+
 
 @app.get("/")
 async def root():
@@ -51,87 +134,235 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/api/stats")
+async def stats():
+    """Cache, worker pool, job queue and OCR counters for monitoring"""
+    return {
+        "cache": await run_in_threadpool(analysis_cache.stats),
+        "pool": analysis_pool.stats(),
+        "jobs": job_runner.stats(),
+        "ocr": ocr_service.stats(),
+    }
+
+
+def validate_extension(filename: Optional[str]) -> str:
+    """Return the lower-cased extension, rejecting unsupported file types"""
+    file_ext = os.path.splitext(filename or "")[1].lower()
+    if file_ext not in ALLOWED_EXTENSIONS:
+        raise UploadRejected(
+            400,
+            f"Invalid file type. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
+        )
+    return file_ext
+
+
+async def run_analysis(content: bytes, file_ext: str, wait: bool = False) -> AnalysisResponse:
+    """
+    Analyze an upload, serving repeats from the cache
+
+    Parsing runs in the worker pool and cache lookups/stores (which may
+    hit the SQLite backend) in a thread, so the event loop stays
+    responsive. With `wait=False` a full pool raises PoolBusyError
+    immediately.
+    """
+    key = cache_key(content, file_ext)
+    cached = await run_in_threadpool(analysis_cache.get, key)
+    if cached is not None:
+        return cached
+    
+    response = await analysis_pool.analyze(content, file_ext, wait=wait)
+    await run_in_threadpool(analysis_cache.put, key, response)
+    return response
+
+
 @app.post("/api/analyze", response_model=AnalysisResponse)
 async def analyze_resume(file: UploadFile = File(...)):
     """
     Analyze uploaded resume and return comprehensive ATS analysis
     """
-    # Validate file extension
-    file_ext = os.path.splitext(file.filename)[1].lower()
-    if file_ext not in ALLOWED_EXTENSIONS:
+    # Validate file extension, then read the content in chunks,
+    # validating size and file signature
+    try:
+        file_ext = validate_extension(file.filename)
+        content = await upload_ingest.read(file, file_ext)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    
+    try:
+        # Parse and analyze straight from the uploaded bytes (no temp file)
+        return await run_analysis(content, file_ext)
+        
+    except (PoolBusyError, OCRBusyError):
         raise HTTPException(
-            status_code=400,
-            detail=f"Invalid file type. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
+            status_code=503,
+            detail="Server is busy, please try again shortly",
+            headers={"Retry-After": str(BUSY_RETRY_AFTER_SECONDS)}
         )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def format_stream_event(stage: str, payload, stream_format: str) -> str:
+    """Encode one stage as an SSE event or an NDJSON line"""
+    data = jsonable_encoder(payload)
+    if stream_format == "ndjson":
+        return json.dumps({"event": stage, "data": data}) + "\n"
+    return f"event: {stage}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/api/analyze/stream")
+async def analyze_resume_stream(
+    file: UploadFile = File(...),
+    stream_format: str = Query("sse", alias="format", pattern="^(sse|ndjson)$")
+):
+    """
+    Analyze uploaded resume, streaming results as each stage finishes
     
-    # Read file content
-    content = await file.read()
+    Emits Server-Sent Events (or NDJSON lines with ?format=ndjson) in order:
+    text, candidate, skills, domain, score, feedback, then complete with
+    the full AnalysisResponse. Failures after streaming starts are
+    reported as an "error" event.
+    """
+    try:
+        file_ext = validate_extension(file.filename)
+        content = await upload_ingest.read(file, file_ext)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     
-    # Validate file size
-    if len(content) > MAX_FILE_SIZE:
+    key = cache_key(content, file_ext)
+    cached = await run_in_threadpool(analysis_cache.get, key)
+    if cached is None and analysis_pool.slots.locked():
         raise HTTPException(
-            status_code=400,
-            detail="File size exceeds 5MB limit"
+            status_code=503,
+            detail="Server is busy, please try again shortly",
+            headers={"Retry-After": str(BUSY_RETRY_AFTER_SECONDS)}
         )
     
-    try:
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as tmp_file:
-            tmp_file.write(content)
-            tmp_path = tmp_file.name
-        
-        # Parse resume
-        parsed_data = resume_parser.parse(tmp_path, file_ext)
-        
-        # Get OCR metadata
-        parsing_method = parsed_data.get("parsing_method", "standard")
-        ocr_confidence = parsed_data.get("ocr_confidence")
-        
-        # Extract skills
-        skills_data = skill_extractor.extract(parsed_data["raw_text"])
-        
-        # Classify domain
-        domain_data = domain_classifier.classify(parsed_data["raw_text"], skills_data)
+    async def event_stream():
+        if cached is not None:
+            for stage, payload in replay_stages(cached):
+                yield format_stream_event(stage, payload, stream_format)
+            return
         
-        # Calculate ATS score (OCR-aware)
-        ats_analysis = ats_scorer.calculate_score(
-            parsed_data, 
-            skills_data, 
-            domain_data,
-            parsing_method=parsing_method,
-            ocr_confidence=ocr_confidence
+        try:
+            # Stages run in a pool worker; each event is sent as soon as
+            # its stage finishes
+            stages = analysis_pool.iter_stages(content, file_ext, wait=True)
+            async for stage, payload in stages:
+                if stage == STAGE_COMPLETE:
+                    await run_in_threadpool(analysis_cache.put, key, payload)
+                yield format_stream_event(stage, payload, stream_format)
+        except Exception as e:
+            yield format_stream_event("error", {"detail": str(e)}, stream_format)
+    
+    media_type = "application/x-ndjson" if stream_format == "ndjson" else "text/event-stream"
+    return StreamingResponse(
+        event_stream(),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/api/analyze/batch", response_model=BatchAnalysisResponse)
+async def analyze_resume_batch(files: List[UploadFile] = File(...)):
+    """
+    Analyze many resumes in one request
+    
+    Each file gets the same validation as /api/analyze. Files are analyzed
+    in parallel across the worker pool and results are returned in input
+    order, with a per-file error instead of failing the whole batch.
+    """
+    if len(files) > MAX_BATCH_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files. Maximum {MAX_BATCH_FILES} files per batch"
         )
+    
+    items: List[Optional[BatchAnalysisItem]] = [None] * len(files)
+    tasks = {}
+    total_size = 0
+    
+    for index, file in enumerate(files):
+        try:
+            file_ext = validate_extension(file.filename)
+            content = await upload_ingest.read(file, file_ext)
+            total_size += len(content)
+            if total_size > MAX_BATCH_SIZE:
+                raise UploadRejected(
+                    400, f"Batch size exceeds {MAX_BATCH_SIZE // (1024 * 1024)}MB limit"
+                )
+        except UploadRejected as e:
+            items[index] = BatchAnalysisItem(filename=file.filename, success=False, error=e.detail)
+            continue
         
-        # Cleanup temporary file
-        os.unlink(tmp_path)
-        
-        # Build response
-        response = AnalysisResponse(
-            success=True,
-            candidate=parsed_data["candidate"],
-            ats_score=ats_analysis["score"],
-            score_breakdown=ats_analysis["breakdown"],
-            score_category=ats_analysis["category"],
-            domain=domain_data,
-            skills=skills_data,
-            projects=parsed_data["projects"],
-            experience=parsed_data["experience"],
-            education=parsed_data["education"],
-            issues=ats_analysis["issues"],
-            suggestions=ats_analysis["suggestions"],
-            keywords_analysis=ats_analysis["keywords_analysis"],
-            # OCR metadata
-            parsing_method=parsing_method,
-            ocr_confidence=ocr_confidence
+        # Identical files in one batch are analyzed once
+        key = cache_key(content, file_ext)
+        if key not in tasks:
+            tasks[key] = asyncio.ensure_future(run_analysis(content, file_ext, wait=True))
+        items[index] = tasks[key]
+    
+    results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+    outcomes = dict(zip(tasks.values(), results))
+    
+    for index, item in enumerate(items):
+        if isinstance(item, BatchAnalysisItem):
+            continue
+        outcome = outcomes[item]
+        if isinstance(outcome, BaseException):
+            items[index] = BatchAnalysisItem(
+                filename=files[index].filename, success=False, error=str(outcome)
+            )
+        else:
+            items[index] = BatchAnalysisItem(
+                filename=files[index].filename, success=True, result=outcome
+            )
+    
+    return BatchAnalysisResponse(
+        success=all(item.success for item in items),
+        results=items
+    )
+
+
+@app.post("/api/jobs", response_model=JobStatus, status_code=202)
+async def submit_job(file: UploadFile = File(...)):
+    """
+    Queue a resume for analysis and return its job ID immediately
+    
+    Poll GET /api/jobs/{job_id} for progress and the final analysis.
+    Useful for scanned resumes whose OCR can outlast proxy timeouts.
+    """
+    try:
+        file_ext = validate_extension(file.filename)
+        content = await upload_ingest.read(file, file_ext)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    
+    try:
+        job_id = await job_runner.submit(content, file_ext, file.filename)
+    except JobQueueFullError:
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy, please try again shortly",
+            headers={"Retry-After": str(BUSY_RETRY_AFTER_SECONDS)}
         )
-        
-        return response
-        
-    except Exception as e:
-        # Cleanup on error
-        if 'tmp_path' in locals() and os.path.exists(tmp_path):
-            os.unlink(tmp_path)
-        raise HTTPException(status_code=500, detail=str(e))
+    return await get_job(job_id)
+
+
+@app.get("/api/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """
+    Job status and progress; includes the analysis once completed
+    """
+    job = await run_in_threadpool(job_runner.store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    result = job.pop("result")
+    return JobStatus(
+        job_id=job.pop("id"),
+        result=AnalysisResponse.model_validate_json(result) if result else None,
+        **job
+    )
 
 
 @app.post("/api/download-report")
@@ -100,6 +100,11 @@ class KeywordsAnalysis(BaseModel):
     recommended: List[str] = []
 
 
+class OCRPageConfidence(BaseModel):
+    page: int  # 1-based page number
+    confidence: float  # Tesseract mean word confidence 0-100
+
+
 class AnalysisResponse(BaseModel):
     success: bool
     candidate: CandidateInfo
@@ -117,3 +122,31 @@ class AnalysisResponse(BaseModel):
     # OCR metadata
     parsing_method: str = "standard"  # "standard" | "ocr" | "ocr_unavailable"
     ocr_confidence: Optional[str] = None  # "low" | "medium" | "high" (only when OCR used)
+    ocr_tier: Optional[str] = None  # "fast" | "mixed" | "high" - OCR resolution used (only when OCR used)
+    ocr_mean_confidence: Optional[float] = None  # Tesseract mean word confidence 0-100 (only when OCR used)
+    ocr_page_confidences: Optional[List[OCRPageConfidence]] = None  # Per OCR'd page (only when OCR used)
+
+
+class BatchAnalysisItem(BaseModel):
+    filename: Optional[str] = None
+    success: bool
+    result: Optional[AnalysisResponse] = None
+    error: Optional[str] = None
+
+
+class BatchAnalysisResponse(BaseModel):
+    success: bool  # True only if every file was analyzed
+    results: List[BatchAnalysisItem] = []
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    status: str  # "queued" | "running" | "completed" | "failed"
+    stage: Optional[str] = None  # Last finished pipeline stage
+    progress: int = 0  # 0-100
+    filename: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[AnalysisResponse] = None  # Only when completed
+    error: Optional[str] = None  # Only when failed
@@ -0,0 +1,178 @@
+"""
+Analysis Cache - Content-hash keyed cache of finished analysis results
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.models.schemas import AnalysisResponse
+from app.services.resume_parser import ResumeParser
+from app.services.skill_extractor import SkillExtractor
+from app.services.domain_classifier import DomainClassifier
+from app.services.ats_scorer import ATSScorer
+from app.services.ocr_service import OCRService
+from app.services.pdf_document import PdfDocument
+from app.services.persistent_cache import SQLiteAnalysisCache
+
+
+# Bump when pipeline logic changes in a way the rule tables below don't capture
+PIPELINE_VERSION = "1"
+
+# Services whose class-level rule tables (taxonomies, keywords, thresholds)
+# feed into the fingerprint, so editing a table invalidates cached results
+_VERSIONED_SERVICES = (
+    ResumeParser, SkillExtractor, DomainClassifier, ATSScorer, OCRService, PdfDocument
+)
+
+
+def _canonical(value: Any) -> Any:
+    """Order-independent representation of a rule table (sets, dicts)"""
+    if isinstance(value, dict):
+        return sorted((repr(k), _canonical(v)) for k, v in value.items())
+    if isinstance(value, (set, frozenset)):
+        return sorted(repr(_canonical(v)) for v in value)
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return repr(value)
+
+
+def _compute_pipeline_version() -> str:
+    digest = hashlib.sha256(PIPELINE_VERSION.encode())
+    for service in _VERSIONED_SERVICES:
+        rules = {
+            name: value for name, value in vars(service).items()
+            if name.isupper()
+        }
+        digest.update(service.__name__.encode())
+        digest.update(repr(_canonical(rules)).encode())
+    return digest.hexdigest()[:16]
+
+
+pipeline_version = _compute_pipeline_version()
+
+
+def cache_key(content: bytes, file_ext: str) -> str:
+    """SHA-256 of the upload, scoped to the file type and pipeline version"""
+    digest = hashlib.sha256(content).hexdigest()
+    return f"{pipeline_version}:{file_ext}:{digest}"
+
+
+class AnalysisCache:
+    """
+    In-process LRU cache of serialized AnalysisResponse objects
+
+    Features:
+    - Bounded by total serialized size, evicting least recently used
+    - Entries expire after a TTL
+    - Optional persistent backend (shared by all workers) consulted on
+      in-memory misses and written through on every put
+    - Hit/miss/eviction counters for monitoring
+    - Thread-safe
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl_seconds: int,
+        backend: Optional[SQLiteAnalysisCache] = None
+    ):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.backend_hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 or self.backend is not None
+
+    def get(self, key: str) -> Optional[AnalysisResponse]:
+        """Return the cached response, or None on miss/expiry"""
+        if not self.enabled:
+            return None
+        payload = self._get_memory(key)
+        if payload is None and self.backend is not None:
+            payload = self.backend.get(key)
+            if payload is not None:
+                self._put_memory(key, payload)
+                with self._lock:
+                    self.backend_hits += 1
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return AnalysisResponse.model_validate_json(payload)
+
+    def _get_memory(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, response: AnalysisResponse) -> None:
+        """Store a response, evicting older entries to stay within budget"""
+        if not self.enabled:
+            return
+        # Degraded results (OCR timed out or failed) are not cached, so a
+        # retry gets a fresh attempt
+        if response.parsing_method == "ocr_unavailable":
+            return
+        payload = response.model_dump_json()
+        self._put_memory(key, payload)
+        if self.backend is not None:
+            self.backend.put(key, payload)
+
+    def _put_memory(self, key: str, payload: str) -> None:
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, payload)
+            self._size += len(payload)
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and current usage"""
+        backend_stats = self.backend.stats() if self.backend is not None else None
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "backend_hits": self.backend_hits,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "pipeline_version": pipeline_version,
+                "backend": backend_stats,
+            }
+
+    def _remove(self, key: str) -> None:
+        _, payload = self._entries.pop(key)
+        self._size -= len(payload)
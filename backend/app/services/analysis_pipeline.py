@@ -0,0 +1,157 @@
+"""
+Analysis Pipeline - Runs parse → extract → classify → score for one resume
+"""
+from typing import Any, Iterator, Optional, Tuple
+
+from app.models.schemas import AnalysisResponse
+from app.services.resume_parser import ResumeParser
+from app.services.skill_extractor import SkillExtractor
+from app.services.domain_classifier import DomainClassifier
+from app.services.ats_scorer import ATSScorer
+from app.services.document_source import DocumentSource
+
+
+# Pipeline stages, in the order they finish
+STAGE_TEXT = "text"
+STAGE_CANDIDATE = "candidate"
+STAGE_SKILLS = "skills"
+STAGE_DOMAIN = "domain"
+STAGE_SCORE = "score"
+STAGE_FEEDBACK = "feedback"
+STAGE_COMPLETE = "complete"
+
+# AnalysisResponse fields reported by each intermediate stage
+STAGE_FIELDS = (
+    (STAGE_TEXT, (
+        "parsing_method", "ocr_confidence", "ocr_tier",
+        "ocr_mean_confidence", "ocr_page_confidences"
+    )),
+    (STAGE_CANDIDATE, ("candidate", "experience", "projects", "education")),
+    (STAGE_SKILLS, ("skills",)),
+    (STAGE_DOMAIN, ("domain",)),
+    (STAGE_SCORE, ("ats_score", "score_breakdown", "score_category", "keywords_analysis")),
+    (STAGE_FEEDBACK, ("issues", "suggestions")),
+)
+
+
+class AnalysisPipeline:
+    """Full resume analysis built from the individual services"""
+
+    def __init__(
+        self,
+        resume_parser: Optional[ResumeParser] = None,
+        skill_extractor: Optional[SkillExtractor] = None,
+        domain_classifier: Optional[DomainClassifier] = None,
+        ats_scorer: Optional[ATSScorer] = None
+    ):
+        self.resume_parser = resume_parser or ResumeParser()
+        self.skill_extractor = skill_extractor or SkillExtractor()
+        self.domain_classifier = domain_classifier or DomainClassifier()
+        self.ats_scorer = ats_scorer or ATSScorer()
+
+    def analyze(self, source: DocumentSource, file_ext: str) -> AnalysisResponse:
+        """
+        Analyze a resume and build the API response
+
+        Args:
+            source: File path or the document's bytes
+            file_ext: ".pdf" or ".docx"
+        """
+        for stage, payload in self.iter_stages(source, file_ext):
+            if stage == STAGE_COMPLETE:
+                return payload
+
+    def iter_stages(
+        self,
+        source: DocumentSource,
+        file_ext: str
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        Run the pipeline, yielding each stage's results as soon as it finishes
+
+        Yields (stage, payload) pairs in STAGE_FIELDS order. Every payload except
+        the last is a dict of AnalysisResponse fields; the final "complete"
+        stage yields the full AnalysisResponse.
+        """
+        # Extract text (and OCR if needed)
+        extracted = self.resume_parser.extract_text(source, file_ext)
+
+        # Get OCR metadata
+        parsing_method = extracted.get("parsing_method", "standard")
+        ocr_confidence = extracted.get("ocr_confidence")
+        ocr_tier = extracted.get("ocr_tier")
+        ocr_mean_confidence = extracted.get("ocr_mean_confidence")
+        ocr_page_confidences = extracted.get("ocr_page_confidences")
+        yield STAGE_TEXT, {
+            "parsing_method": parsing_method,
+            "ocr_confidence": ocr_confidence,
+            "ocr_tier": ocr_tier,
+            "ocr_mean_confidence": ocr_mean_confidence,
+            "ocr_page_confidences": ocr_page_confidences
+        }
+
+        # Parse sections and structured data
+        parsed_data = self.resume_parser.parse_structure(extracted)
+        yield STAGE_CANDIDATE, {
+            "candidate": parsed_data["candidate"],
+            "experience": parsed_data["experience"],
+            "projects": parsed_data["projects"],
+            "education": parsed_data["education"]
+        }
+
+        # Extract skills
+        skills_data = self.skill_extractor.extract(parsed_data["raw_text"])
+        yield STAGE_SKILLS, {"skills": skills_data}
+
+        # Classify domain
+        domain_data = self.domain_classifier.classify(parsed_data["raw_text"], skills_data)
+        yield STAGE_DOMAIN, {"domain": domain_data}
+
+        # Calculate ATS score (OCR-aware)
+        ats_analysis = self.ats_scorer.calculate_score(
+            parsed_data,
+            skills_data,
+            domain_data,
+            parsing_method=parsing_method,
+            ocr_confidence=ocr_confidence
+        )
+        yield STAGE_SCORE, {
+            "ats_score": ats_analysis["score"],
+            "score_breakdown": ats_analysis["breakdown"],
+            "score_category": ats_analysis["category"],
+            "keywords_analysis": ats_analysis["keywords_analysis"]
+        }
+        yield STAGE_FEEDBACK, {
+            "issues": ats_analysis["issues"],
+            "suggestions": ats_analysis["suggestions"]
+        }
+
+        # Build response
+        yield STAGE_COMPLETE, AnalysisResponse(
+            success=True,
+            candidate=parsed_data["candidate"],
+            ats_score=ats_analysis["score"],
+            score_breakdown=ats_analysis["breakdown"],
+            score_category=ats_analysis["category"],
+            domain=domain_data,
+            skills=skills_data,
+            projects=parsed_data["projects"],
+            experience=parsed_data["experience"],
+            education=parsed_data["education"],
+            issues=ats_analysis["issues"],
+            suggestions=ats_analysis["suggestions"],
+            keywords_analysis=ats_analysis["keywords_analysis"],
+            # OCR metadata
+            parsing_method=parsing_method,
+            ocr_confidence=ocr_confidence,
+            ocr_tier=ocr_tier,
+            ocr_mean_confidence=ocr_mean_confidence,
+            ocr_page_confidences=ocr_page_confidences
+        )
+
+
+def replay_stages(response: AnalysisResponse) -> Iterator[Tuple[str, Any]]:
+    """Stage events for an already finished analysis (e.g. a cache hit)"""
+    for stage, fields in STAGE_FIELDS:
+        yield stage, {field: getattr(response, field) for field in fields}
+    yield STAGE_COMPLETE, response
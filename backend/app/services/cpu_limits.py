@@ -0,0 +1,50 @@
+"""
+CPU Limits - How many CPUs this process can really use (container-aware)
+"""
+import math
+import os
+from typing import Optional
+
+
+def available_cpus() -> int:
+    """
+    CPUs this process may actually use
+
+    Takes the smallest of the CPU affinity mask and the cgroup CPU quota
+    (v2 `cpu.max` or v1 `cpu.cfs_quota_us`), so containers limited to
+    e.g. 2 CPUs on a 64-core host get 2, not 64.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cpus = os.cpu_count() or 1
+
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return max(1, cpus)
+
+
+def _cgroup_cpu_quota() -> Optional[float]:
+    """CPU quota in cores from cgroup v2 or v1, or None if unlimited"""
+    # cgroup v2: "<quota> <period>" or "max <period>"
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+
+    # cgroup v1: quota of -1 means unlimited
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
@@ -0,0 +1,98 @@
+"""
+Document Source - In-memory inputs for the parsing pipeline
+
+Uploads are parsed straight from memory. A filesystem path is only
+materialized for external tools that require one (pdf2image/poppler), and
+that file lives in memory (memfd or tmpfs) rather than on disk.
+"""
+import io
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Union
+
+
+# A document can be given as a path or as its raw bytes
+DocumentSource = Union[str, bytes, bytearray, memoryview, BinaryIO]
+
+# tmpfs mount used when memfd_create is not available
+SHM_DIR = "/dev/shm"
+
+
+def open_source(source: DocumentSource) -> Union[str, BinaryIO]:
+    """
+    Return something pypdf/zipfile/python-docx can read directly
+
+    Paths are passed through; bytes-like sources are wrapped in a
+    BytesIO without writing anything to disk.
+    """
+    if isinstance(source, str):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+
+def source_bytes(source: DocumentSource) -> bytes:
+    """Return the document's raw bytes"""
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return f.read()
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, (bytearray, memoryview)):
+        return bytes(source)
+    if isinstance(source, io.BytesIO):
+        return source.getvalue()
+    source.seek(0)
+    return source.read()
+
+
+@contextmanager
+def source_path(source: DocumentSource, suffix: str = "") -> Iterator[str]:
+    """
+    Yield a filesystem path for tools that cannot read from memory
+
+    Path sources are yielded as-is. Otherwise the bytes are written once
+    into an anonymous memfd (exposed through /proc) or, failing that, a
+    tmpfs file. The file is released when the context exits.
+
+    Args:
+        source: Document path or bytes
+        suffix: File extension for the tmpfs fallback (e.g. ".pdf")
+    """
+    if isinstance(source, str):
+        yield source
+        return
+
+    data = source if isinstance(source, (bytes, bytearray, memoryview)) else source_bytes(source)
+
+    if hasattr(os, "memfd_create"):
+        try:
+            fd = os.memfd_create("resume", 0)
+        except OSError:
+            fd = None
+        if fd is not None:
+            try:
+                _write_all(fd, data)
+                # Use the pid-qualified path so child processes resolve
+                # this process's descriptor, not their own
+                yield f"/proc/{os.getpid()}/fd/{fd}"
+            finally:
+                os.close(fd)
+            return
+
+    tmp_dir = SHM_DIR if os.access(SHM_DIR, os.W_OK) else None
+    with tempfile.NamedTemporaryFile(suffix=suffix, dir=tmp_dir) as tmp_file:
+        tmp_file.write(data)
+        tmp_file.flush()
+        yield tmp_file.name
+
+
+def _write_all(fd: int, data: Union[bytes, bytearray, memoryview]) -> None:
+    """Write a whole buffer to a file descriptor"""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
@@ -0,0 +1,241 @@
+"""
+DOCX Document Service - Single-load streaming DOCX reader
+"""
+import posixpath
+import zipfile
+from lxml import etree
+from typing import List, Optional
+from app.services.document_source import DocumentSource, open_source
+
+
+# WordprocessingML namespaces
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+
+OFFICE_DOCUMENT_RELTYPE = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+)
+WML_DOCUMENT_MAIN = (
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"
+)
+
+
+def _w(tag: str) -> str:
+    return "{%s}%s" % (W_NS, tag)
+
+
+W_BODY = _w("body")
+W_P = _w("p")
+W_R = _w("r")
+W_HYPERLINK = _w("hyperlink")
+W_TBL = _w("tbl")
+W_TBLGRID = _w("tblGrid")
+W_GRIDCOL = _w("gridCol")
+W_TR = _w("tr")
+W_TC = _w("tc")
+W_TCPR = _w("tcPr")
+W_GRIDSPAN = _w("gridSpan")
+W_VMERGE = _w("vMerge")
+W_VAL = _w("val")
+W_TYPE = _w("type")
+
+# Run inner-content elements and their text equivalents (w:t and w:br are
+# handled separately since their text depends on content/attributes)
+RUN_CONTENT_TEXT = {
+    _w("tab"): "\t",
+    _w("ptab"): "\t",
+    _w("cr"): "\n",
+    _w("noBreakHyphen"): "-",
+}
+W_T = _w("t")
+W_BR = _w("br")
+
+
+class DocxDocument:
+    """
+    Parsed DOCX for a single request
+
+    Opens the zip package once and streams the main document part with an
+    incremental XML parser instead of building the python-docx object model.
+    Each top-level paragraph or table is processed as soon as it closes and
+    then discarded, so memory stays proportional to the largest block.
+
+    Text follows python-docx semantics exactly:
+    - Body paragraphs first (one per line), then table rows
+    - Each table row is its grid cells' text separated by spaces, with
+      merged cells repeated the way `row.cells` repeats them
+    """
+
+    def __init__(self, source: DocumentSource):
+        self.source = source
+        self.paragraphs: List[str] = []
+        self.table_rows: List[List[str]] = []
+        self.table_count = 0
+        self.has_images = False
+
+        with zipfile.ZipFile(open_source(source)) as package:
+            document_part = self._find_main_document_part(package)
+            self.has_images = self._check_image_rels(package, document_part)
+            with package.open(document_part) as stream:
+                self._stream_body(stream)
+
+    @property
+    def has_tables(self) -> bool:
+        """Whether the document body contains at least one table"""
+        return self.table_count > 0
+
+    @property
+    def text(self) -> str:
+        """Document text: paragraphs, then table rows"""
+        parts = [para + "\n" for para in self.paragraphs]
+        for row in self.table_rows:
+            parts.extend(cell + " " for cell in row)
+            parts.append("\n")
+        return "".join(parts)
+
+    def _find_main_document_part(self, package: zipfile.ZipFile) -> str:
+        """Resolve the main document part name from the package relationships"""
+        rels = etree.fromstring(package.read("_rels/.rels"))
+        target = None
+        for rel in rels.iter("{%s}Relationship" % PKG_REL_NS):
+            if rel.get("Type") == OFFICE_DOCUMENT_RELTYPE:
+                target = rel.get("Target")
+                break
+        if target is None:
+            raise ValueError("package has no main document part")
+        part_name = posixpath.normpath(target.lstrip("/"))
+
+        # Same content-type guard as python-docx's Document()
+        content_type = self._part_content_type(package, part_name)
+        if content_type != WML_DOCUMENT_MAIN:
+            raise ValueError(f"not a Word document, content type is '{content_type}'")
+        return part_name
+
+    def _part_content_type(self, package: zipfile.ZipFile, part_name: str) -> Optional[str]:
+        """Look up a part's content type in [Content_Types].xml"""
+        types = etree.fromstring(package.read("[Content_Types].xml"))
+        for override in types.iter("{%s}Override" % CT_NS):
+            if override.get("PartName", "").lstrip("/").lower() == part_name.lower():
+                return override.get("ContentType")
+        ext = posixpath.splitext(part_name)[1].lstrip(".").lower()
+        for default in types.iter("{%s}Default" % CT_NS):
+            if default.get("Extension", "").lower() == ext:
+                return default.get("ContentType")
+        return None
+
+    def _check_image_rels(self, package: zipfile.ZipFile, part_name: str) -> bool:
+        """Check the document part's relationships for image references"""
+        part_dir, part_file = posixpath.split(part_name)
+        rels_name = posixpath.join(part_dir, "_rels", part_file + ".rels")
+        if rels_name not in package.NameToInfo:
+            return False
+        rels = etree.fromstring(package.read(rels_name))
+        for rel in rels.iter("{%s}Relationship" % PKG_REL_NS):
+            if "image" in rel.get("Type", ""):
+                return True
+        return False
+
+    def _stream_body(self, stream) -> None:
+        """
+        Incrementally parse the document part
+
+        Only direct children of w:body are collected, matching
+        `Document.paragraphs` and `Document.tables`.
+        """
+        depth = 0
+        body_depth: Optional[int] = None
+        parser = etree.iterparse(
+            stream, events=("start", "end"), resolve_entities=False
+        )
+        for event, elem in parser:
+            if event == "start":
+                depth += 1
+                if body_depth is None and elem.tag == W_BODY:
+                    body_depth = depth
+                continue
+
+            # "end" event
+            if body_depth is not None and depth == body_depth + 1:
+                if elem.tag == W_P:
+                    self.paragraphs.append(self._paragraph_text(elem))
+                elif elem.tag == W_TBL:
+                    self.table_count += 1
+                    self.table_rows.extend(self._table_rows(elem))
+                # Block is done - release it and any processed siblings
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+            depth -= 1
+
+    def _run_text(self, run) -> str:
+        """Text of a w:r element, as python-docx renders `Run.text`"""
+        parts = []
+        for child in run:
+            tag = child.tag
+            if tag == W_T:
+                parts.append(child.text or "")
+            elif tag == W_BR:
+                br_type = child.get(W_TYPE, "textWrapping")
+                parts.append("\n" if br_type == "textWrapping" else "")
+            else:
+                text = RUN_CONTENT_TEXT.get(tag)
+                if text is not None:
+                    parts.append(text)
+        return "".join(parts)
+
+    def _paragraph_text(self, paragraph) -> str:
+        """Text of a w:p element (runs plus hyperlink runs)"""
+        parts = []
+        for child in paragraph:
+            if child.tag == W_R:
+                parts.append(self._run_text(child))
+            elif child.tag == W_HYPERLINK:
+                parts.extend(self._run_text(r) for r in child if r.tag == W_R)
+        return "".join(parts)
+
+    def _cell_text(self, tc) -> str:
+        """Text of a w:tc element: its direct paragraphs joined by newlines"""
+        return "\n".join(self._paragraph_text(p) for p in tc if p.tag == W_P)
+
+    def _table_rows(self, tbl) -> List[List[str]]:
+        """
+        Cell text for every row of a table
+
+        Mirrors python-docx's layout-grid handling: a horizontally spanned
+        cell repeats once per grid column and a vertically merged
+        continuation repeats the cell above it.
+        """
+        grid = tbl.find(W_TBLGRID)
+        col_count = len(grid.findall(W_GRIDCOL)) if grid is not None else 0
+        rows = [tr for tr in tbl if tr.tag == W_TR]
+
+        cells: List[str] = []
+        for tr in rows:
+            for tc in tr:
+                if tc.tag != W_TC:
+                    continue
+                grid_span, v_merge = self._cell_merge_props(tc)
+                for grid_span_idx in range(grid_span):
+                    if v_merge == "continue":
+                        cells.append(cells[-col_count])
+                    elif grid_span_idx > 0:
+                        cells.append(cells[-1])
+                    else:
+                        cells.append(self._cell_text(tc))
+
+        return [
+            cells[row_idx * col_count:row_idx * col_count + col_count]
+            for row_idx in range(len(rows))
+        ]
+
+    def _cell_merge_props(self, tc) -> tuple:
+        """Return (grid_span, vMerge value) for a w:tc element"""
+        tc_pr = tc.find(W_TCPR)
+        if tc_pr is None:
+            return 1, None
+        grid_span_el = tc_pr.find(W_GRIDSPAN)
+        grid_span = int(grid_span_el.get(W_VAL)) if grid_span_el is not None else 1
+        v_merge_el = tc_pr.find(W_VMERGE)
+        v_merge = v_merge_el.get(W_VAL, "continue") if v_merge_el is not None else None
+        return grid_span, v_merge
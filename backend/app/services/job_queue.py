@@ -0,0 +1,404 @@
+"""
+Job Queue - Durable SQLite queue for asynchronous analysis jobs
+"""
+import asyncio
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.models.schemas import AnalysisResponse
+from app.services.analysis_cache import AnalysisCache, cache_key
+from app.services.analysis_pipeline import STAGE_COMPLETE, STAGE_FIELDS
+from app.services.ocr_service import OCRBusyError
+from app.services.worker_pool import AnalysisWorkerPool, worker_pipeline
+
+
+# Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+# Progress (percent) reported once each pipeline stage has finished
+STAGE_PROGRESS = {
+    stage: round((index + 1) * 100 / (len(STAGE_FIELDS) + 1))
+    for index, (stage, _) in enumerate(STAGE_FIELDS)
+}
+
+
+class JobQueueFullError(Exception):
+    """Raised when too many jobs are already waiting"""
+    pass
+
+
+class JobStore:
+    """
+    SQLite-backed job table shared by all workers on a node
+
+    Features:
+    - Queued jobs (including the uploaded file) survive restarts
+    - Jobs are claimed with a lease; a job whose worker died is picked up
+      again once its lease expires, up to MAX_ATTEMPTS times
+    - Progress is written per pipeline stage, so any process can report it
+    - Uploaded content is dropped as soon as a job finishes, and finished
+      jobs are purged after a retention period
+    """
+
+    BUSY_TIMEOUT_MS = 5000
+    # A running job is considered abandoned when its lease is not renewed
+    # (renewed on every stage) within this time
+    LEASE_SECONDS = 120
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, db_path: str, retention_seconds: int = 86400):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db_path = db_path
+        self.retention_seconds = retention_seconds
+        self._local = threading.local()
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection (sqlite3 connections are not shareable)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=self.BUSY_TIMEOUT_MS / 1000,
+                isolation_level=None  # autocommit; transactions are explicit
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self) -> None:
+        conn = self._connect()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                stage TEXT,
+                progress INTEGER NOT NULL DEFAULT 0,
+                filename TEXT,
+                file_ext TEXT NOT NULL,
+                content BLOB,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                owner TEXT,
+                lease_expires_at REAL,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)"
+        )
+
+    def submit(self, content: bytes, file_ext: str, filename: Optional[str]) -> str:
+        """Queue a new job and return its ID"""
+        job_id = uuid.uuid4().hex
+        self._connect().execute(
+            "INSERT INTO jobs (id, status, filename, file_ext, content, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, JOB_QUEUED, filename, file_ext, content, time.time())
+        )
+        return job_id
+
+    def submit_completed(
+        self,
+        file_ext: str,
+        filename: Optional[str],
+        result: str
+    ) -> str:
+        """Record an already finished job (e.g. a cache hit) and return its ID"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._connect().execute(
+            "INSERT INTO jobs (id, status, stage, progress, filename, file_ext, result, "
+            "created_at, started_at, finished_at) VALUES (?, ?, ?, 100, ?, ?, ?, ?, ?, ?)",
+            (job_id, JOB_COMPLETED, STAGE_COMPLETE, filename, file_ext, result, now, now, now)
+        )
+        return job_id
+
+    def claim(self, owner: str) -> Optional[Tuple[str, bytes, str]]:
+        """
+        Take the oldest runnable job: queued, or running with an expired lease
+
+        Returns:
+            (job_id, content, file_ext), or None if nothing is runnable
+        """
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Give up on jobs that keep killing their worker
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, content = NULL, finished_at = ? "
+                "WHERE status = ? AND lease_expires_at < ? AND attempts >= ?",
+                (JOB_FAILED, "Analysis did not finish after repeated attempts", now,
+                 JOB_RUNNING, now, self.MAX_ATTEMPTS)
+            )
+            row = conn.execute(
+                "SELECT id, content, file_ext FROM jobs "
+                "WHERE status = ? OR (status = ? AND lease_expires_at < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (JOB_QUEUED, JOB_RUNNING, now)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, stage = NULL, progress = 0, "
+                    "attempts = attempts + 1, owner = ?, lease_expires_at = ?, "
+                    "started_at = ? WHERE id = ?",
+                    (JOB_RUNNING, owner, now + self.LEASE_SECONDS, now, row["id"])
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if row is None:
+            return None
+        return row["id"], row["content"], row["file_ext"]
+
+    def set_progress(self, job_id: str, stage: str) -> None:
+        """Record a finished stage and renew the job's lease"""
+        self._connect().execute(
+            "UPDATE jobs SET stage = ?, progress = ?, lease_expires_at = ? "
+            "WHERE id = ? AND status = ?",
+            (stage, STAGE_PROGRESS.get(stage, 0), time.time() + self.LEASE_SECONDS,
+             job_id, JOB_RUNNING)
+        )
+
+    def complete(self, job_id: str, result: str) -> None:
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, stage = ?, progress = 100, result = ?, "
+            "content = NULL, owner = NULL, lease_expires_at = NULL, finished_at = ? "
+            "WHERE id = ?",
+            (JOB_COMPLETED, STAGE_COMPLETE, result, time.time(), job_id)
+        )
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, error = ?, content = NULL, owner = NULL, "
+            "lease_expires_at = NULL, finished_at = ? WHERE id = ?",
+            (JOB_FAILED, error, time.time(), job_id)
+        )
+
+    def requeue(self, job_id: str) -> None:
+        """Put a job back in the queue without counting the attempt"""
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, stage = NULL, progress = 0, owner = NULL, "
+            "lease_expires_at = NULL, attempts = MAX(attempts - 1, 0) "
+            "WHERE id = ? AND status = ?",
+            (JOB_QUEUED, job_id, JOB_RUNNING)
+        )
+
+    def release(self, owner: str) -> None:
+        """Put jobs held by a stopping worker straight back in the queue"""
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, stage = NULL, progress = 0, owner = NULL, "
+            "lease_expires_at = NULL, attempts = MAX(attempts - 1, 0) "
+            "WHERE status = ? AND owner = ?",
+            (JOB_QUEUED, JOB_RUNNING, owner)
+        )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(
+            "SELECT id, status, stage, progress, filename, result, error, "
+            "created_at, started_at, finished_at FROM jobs WHERE id = ?",
+            (job_id,)
+        ).fetchone()
+        return dict(row) if row is not None else None
+
+    def queued_count(self) -> int:
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = ?", (JOB_QUEUED,)
+        ).fetchone()[0]
+
+    def purge(self) -> int:
+        """Delete finished jobs older than the retention period"""
+        cursor = self._connect().execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+            (JOB_COMPLETED, JOB_FAILED, time.time() - self.retention_seconds)
+        )
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            counts = dict(self._connect().execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall())
+        except sqlite3.Error:
+            counts = {}
+        return {
+            "path": self.db_path,
+            JOB_QUEUED: counts.get(JOB_QUEUED, 0),
+            JOB_RUNNING: counts.get(JOB_RUNNING, 0),
+            JOB_COMPLETED: counts.get(JOB_COMPLETED, 0),
+            JOB_FAILED: counts.get(JOB_FAILED, 0),
+        }
+
+
+# Per-process job stores, opened on first use in each pool worker
+_worker_stores: Dict[str, JobStore] = {}
+
+
+def run_job_in_worker(
+    db_path: str,
+    job_id: str,
+    content: bytes,
+    file_ext: str
+) -> AnalysisResponse:
+    """Run the pipeline for a job, recording progress after every stage"""
+    store = _worker_stores.get(db_path)
+    if store is None:
+        store = _worker_stores[db_path] = JobStore(db_path)
+
+    for stage, payload in worker_pipeline().iter_stages(content, file_ext):
+        if stage == STAGE_COMPLETE:
+            return payload
+        store.set_progress(job_id, stage)
+
+
+class JobRunner:
+    """
+    Background tasks that take jobs from the store and analyze them
+
+    Features:
+    - Runs jobs through the shared worker pool (waiting for a slot, so
+      bursts queue on disk instead of being rejected)
+    - Repeat uploads are served from the analysis cache
+    - Wakes immediately on local submits and polls for jobs submitted by
+      other processes or abandoned by a dead worker
+    """
+
+    POLL_INTERVAL_SECONDS = 2.0
+    PURGE_INTERVAL_SECONDS = 600
+    OCR_BUSY_BACKOFF_SECONDS = 5.0
+
+    def __init__(
+        self,
+        store: JobStore,
+        pool: AnalysisWorkerPool,
+        cache: Optional[AnalysisCache] = None,
+        concurrency: int = 1,
+        max_queued: int = 1000
+    ):
+        self.store = store
+        self.pool = pool
+        self.cache = cache
+        self.concurrency = max(1, concurrency)
+        self.max_queued = max_queued
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._tasks = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._last_purge = 0.0
+
+    async def submit(self, content: bytes, file_ext: str, filename: Optional[str]) -> str:
+        """
+        Queue an upload for analysis and return the job ID
+
+        Raises:
+            JobQueueFullError: If max_queued jobs are already waiting
+        """
+        if self.cache is not None:
+            cached = await run_in_threadpool(self.cache.get, cache_key(content, file_ext))
+            if cached is not None:
+                return await run_in_threadpool(
+                    self.store.submit_completed, file_ext, filename, cached.model_dump_json()
+                )
+
+        if await run_in_threadpool(self.store.queued_count) >= self.max_queued:
+            raise JobQueueFullError("Job queue is full")
+        job_id = await run_in_threadpool(self.store.submit, content, file_ext, filename)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job_id
+
+    def start(self) -> None:
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.ensure_future(self._work()) for _ in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Interrupted jobs go back to the queue instead of waiting out their lease
+        await run_in_threadpool(self.store.release, self.owner)
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                claimed = await run_in_threadpool(self.store.claim, self.owner)
+            except sqlite3.Error as e:
+                print(f"Job queue error: {str(e)}")
+                claimed = None
+
+            if claimed is None:
+                await self._idle()
+                continue
+
+            job_id, content, file_ext = claimed
+            await self._run(job_id, content, file_ext)
+
+    async def _idle(self) -> None:
+        now = time.monotonic()
+        if now - self._last_purge > self.PURGE_INTERVAL_SECONDS:
+            self._last_purge = now
+            try:
+                await run_in_threadpool(self.store.purge)
+            except sqlite3.Error as e:
+                print(f"Job queue purge error: {str(e)}")
+
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), self.POLL_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self, job_id: str, content: bytes, file_ext: str) -> None:
+        key = cache_key(content, file_ext)
+        try:
+            # The cache may hit its SQLite backend: keep it off the event loop
+            response = None
+            if self.cache is not None:
+                response = await run_in_threadpool(self.cache.get, key)
+            if response is None:
+                response = await self.pool.run(
+                    run_job_in_worker, self.store.db_path, job_id, content, file_ext,
+                    wait=True
+                )
+                if self.cache is not None:
+                    await run_in_threadpool(self.cache.put, key, response)
+            await run_in_threadpool(self.store.complete, job_id, response.model_dump_json())
+        except asyncio.CancelledError:
+            raise
+        except OCRBusyError:
+            # OCR is saturated: back off, then let the job wait its turn
+            # again instead of failing it
+            await asyncio.sleep(self.OCR_BUSY_BACKOFF_SECONDS)
+            await run_in_threadpool(self.store.requeue, job_id)
+        except Exception as e:
+            await run_in_threadpool(self.store.fail, job_id, str(e))
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.store.stats()
+        stats["runners"] = self.concurrency
+        stats["max_queued"] = self.max_queued
+        return stats
@@ -0,0 +1,205 @@
+"""
+OCR Preprocessing - Vectorized page-image cleanup before Tesseract
+"""
+# NumPy is optional - without it OCRService keeps the PIL filter chain
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from PIL import Image
+except ImportError:
+    pass
+
+
+class NumpyPreprocessor:
+    """
+    Grayscale → contrast normalization → binarization → optional deskew,
+    worked on a single uint8 buffer
+
+    Features:
+    - Contrast stretch and global (Otsu) threshold are folded into one
+      256-entry lookup table, applied in place band by band
+    - Adaptive mode thresholds each pixel against the mean of its tile,
+      computed on a small grid instead of a full-size float image
+    - Deskew estimates the angle from row projections of a downsampled
+      copy and rotates only when the page is visibly skewed
+    - Temporaries are bounded by BAND_ROWS rows, so peak memory stays
+      close to the render plus one working buffer
+    """
+
+    BINARIZE_MODES = ("otsu", "adaptive", "none")
+
+    # Share of the darkest/lightest pixels clipped by contrast normalization
+    CONTRAST_CLIP_PERCENT = 1.0
+
+    # Adaptive binarization: tile size, and how much darker than the
+    # smoothed tile mean a pixel must be to count as ink
+    ADAPTIVE_TILE = 32
+    ADAPTIVE_OFFSET = 12
+
+    # Deskew search range and fine step (degrees), the smallest angle
+    # worth a rotation and the width the page is sampled down to
+    DESKEW_MAX_ANGLE = 5.0
+    DESKEW_STEP = 0.25
+    DESKEW_MIN_ANGLE = 0.3
+    DESKEW_SAMPLE_WIDTH = 800
+
+    # Rows processed at once by lookup-table and threshold passes
+    BAND_ROWS = 256
+
+    def __init__(self, binarize: str = "otsu", deskew: bool = False):
+        """
+        Args:
+            binarize: "otsu" (global threshold), "adaptive" (per-tile
+                threshold, for uneven lighting) or "none" (grayscale only)
+            deskew: Straighten pages scanned at a slight angle
+        """
+        if binarize not in self.BINARIZE_MODES:
+            raise ValueError(
+                f"Unknown binarization mode: {binarize} "
+                f"(expected one of {', '.join(self.BINARIZE_MODES)})"
+            )
+        self.binarize = binarize
+        self.deskew = deskew
+
+    def process(self, image: 'Image.Image') -> 'Image.Image':
+        """
+        Clean up a rendered page for OCR
+
+        Args:
+            image: PIL Image (any mode; grayscale renders avoid a conversion)
+
+        Returns:
+            Preprocessed grayscale PIL Image sharing the working buffer
+        """
+        if image.mode != 'L':
+            image = image.convert('L')
+
+        # PIL's histogram is computed in C without touching a NumPy copy
+        hist = np.array(image.histogram(), dtype=np.int64)
+        pixels = np.array(image)
+        del image
+
+        lut = self._contrast_lut(hist)
+        if self.binarize == "otsu":
+            # Threshold the stretched histogram, then fold both steps
+            # into the same table
+            stretched = np.bincount(lut, weights=hist, minlength=256)
+            threshold = self._otsu_threshold(stretched)
+            lut = np.where(lut > threshold, 255, 0).astype(np.uint8)
+        self._apply_lut(pixels, lut)
+
+        if self.binarize == "adaptive":
+            self._adaptive_threshold(pixels)
+
+        image = Image.fromarray(pixels)
+        if self.deskew:
+            angle = self._skew_angle(pixels)
+            if abs(angle) >= self.DESKEW_MIN_ANGLE:
+                # Nearest-neighbour keeps a binarized page two-toned
+                resample = Image.BILINEAR if self.binarize == "none" else Image.NEAREST
+                image = image.rotate(angle, resample=resample, expand=False, fillcolor=255)
+        return image
+
+    def _contrast_lut(self, hist: 'np.ndarray') -> 'np.ndarray':
+        """Table stretching the clipped intensity range to 0-255"""
+        levels = np.arange(256, dtype=np.float64)
+        cdf = np.cumsum(hist)
+        total = cdf[-1]
+        clip = total * self.CONTRAST_CLIP_PERCENT / 100
+        low = int(np.searchsorted(cdf, clip, side='right'))
+        high = int(np.searchsorted(cdf, total - clip, side='left'))
+        if high <= low:
+            return np.arange(256, dtype=np.uint8)
+        stretched = (levels - low) * 255.0 / (high - low)
+        return np.clip(np.rint(stretched), 0, 255).astype(np.uint8)
+
+    def _otsu_threshold(self, hist: 'np.ndarray') -> int:
+        """Intensity maximizing between-class variance (ink is <= it)"""
+        levels = np.arange(256, dtype=np.float64)
+        weight_dark = np.cumsum(hist)
+        weight_light = weight_dark[-1] - weight_dark
+        cumulative = np.cumsum(hist * levels)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_dark = cumulative / weight_dark
+            mean_light = (cumulative[-1] - cumulative) / weight_light
+            variance = weight_dark * weight_light * (mean_dark - mean_light) ** 2
+        variance = np.nan_to_num(variance, nan=0.0, posinf=0.0)
+        if not variance.any():
+            # Blank or single-tone page
+            return 127
+        return int(np.argmax(variance))
+
+    def _apply_lut(self, pixels: 'np.ndarray', lut: 'np.ndarray') -> None:
+        for start in range(0, pixels.shape[0], self.BAND_ROWS):
+            band = pixels[start:start + self.BAND_ROWS]
+            band[...] = lut[band]
+
+    def _adaptive_threshold(self, pixels: 'np.ndarray') -> None:
+        """Binarize in place against smoothed per-tile means"""
+        height, width = pixels.shape
+        tile = self.ADAPTIVE_TILE
+        columns = np.arange(0, width, tile)
+        tile_widths = np.diff(np.append(columns, width))
+
+        # Tile means (a grid ~1/1000th of the page)
+        rows = []
+        for start in range(0, height, tile):
+            band = pixels[start:start + tile]
+            column_sums = band.sum(axis=0, dtype=np.uint32)
+            sums = np.add.reduceat(column_sums, columns)
+            rows.append(sums / (tile_widths * band.shape[0]))
+        means = np.vstack(rows)
+
+        # Average each tile with its neighbours to soften tile edges
+        padded = np.pad(means, 1, mode='edge')
+        smoothed = sum(
+            padded[dy:dy + means.shape[0], dx:dx + means.shape[1]]
+            for dy in range(3) for dx in range(3)
+        ) / 9
+        thresholds = np.clip(smoothed - self.ADAPTIVE_OFFSET, 0, 255)
+
+        for index, start in enumerate(range(0, height, tile)):
+            band = pixels[start:start + tile]
+            row_threshold = np.repeat(thresholds[index], tile_widths)
+            ink = band < row_threshold
+            band[...] = 255
+            band[ink] = 0
+
+    def _skew_angle(self, pixels: 'np.ndarray') -> float:
+        """
+        Estimate page skew in degrees (counter-clockwise rotation that
+        straightens the text lines)
+
+        Text lines give the sharpest row-projection profile when they are
+        horizontal, so the angle whose projection has the largest sum of
+        squared row counts wins.
+        """
+        step = -(-pixels.shape[1] // self.DESKEW_SAMPLE_WIDTH)
+        ys, xs = np.nonzero(pixels[::step, ::step] < 128)
+        if ys.size < 100:
+            return 0.0
+        ys = ys.astype(np.float64)
+        xs = xs.astype(np.float64)
+
+        # Whole degrees first, then DESKEW_STEP around the best of them
+        coarse = self._best_angle(ys, xs, np.arange(
+            -self.DESKEW_MAX_ANGLE, self.DESKEW_MAX_ANGLE + 0.5, 1.0
+        ))
+        return self._best_angle(ys, xs, np.arange(
+            coarse - 1 + self.DESKEW_STEP, coarse + 1, self.DESKEW_STEP
+        ))
+
+    def _best_angle(self, ys: 'np.ndarray', xs: 'np.ndarray', angles: 'np.ndarray') -> float:
+        best_angle, best_score = 0.0, -1.0
+        for angle in angles:
+            radians = np.deg2rad(angle)
+            projected = ys * np.cos(radians) - xs * np.sin(radians)
+            counts = np.bincount((projected - projected.min()).astype(np.int64))
+            score = float(np.dot(counts, counts))
+            if score > best_score:
+                best_angle, best_score = float(angle), score
+        return best_angle
@@ -4,14 +4,31 @@ Provides enterprise-grade OCR capabilities without cloud APIs
 """
 import re
 import io
+import os
+import hashlib
+import shlex
+import shutil
 import signal
+import subprocess
 import threading
-from typing import Optional, Tuple, Dict, Any
+import time
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from collections import OrderedDict
+from typing import Callable, Iterator, List, Optional, Tuple, Dict, Any
 from contextlib import contextmanager
+from app import config
+from app.services.cpu_limits import available_cpus
+from app.services.document_source import DocumentSource, open_source, source_path
+from app.services.ocr_preprocessing import NUMPY_AVAILABLE, NumpyPreprocessor
+from app.services.pdf_document import PdfDocument
+from app.services.resume_sections import section_heading
+from app.services.tesseract_engine import TESSEROCR_AVAILABLE, TesseractEngineError, TesserocrEngine
 
 # OCR dependencies - optional imports with fallback
 try:
     from pdf2image import convert_from_path
+    from pdf2image.exceptions import PDFPopplerTimeoutError
     from PIL import Image, ImageEnhance, ImageFilter
     import pytesseract
     OCR_AVAILABLE = True
@@ -24,6 +41,355 @@ class TimeoutError(Exception):
     pass
 
 
+class OCRMetrics:
+    """
+    OCR run counters
+    
+    Process-local until share(): the server process then moves them to
+    shared memory, so analysis worker processes can report into them
+    (see attach()). Processes that never share (CLI, benchmarks) create
+    no multiprocessing objects.
+    """
+    
+    FIELDS = (
+        "runs", "completed", "timed_out", "failed",
+        "pages", "pages_escalated", "processes_killed",
+        "rejected_busy", "degraded_busy",
+        "page_cache_hits", "page_cache_misses", "pages_skipped",
+        "contact_runs", "speculative_started", "speculative_used",
+        "speculative_cancelled"
+    )
+    
+    def __init__(self):
+        self.counters: Any = [0] * len(self.FIELDS)
+        self.shared = False
+        self._lock = threading.Lock()
+    
+    def share(self) -> Any:
+        """Move the counters to shared memory (once) and return them"""
+        with self._lock:
+            if not self.shared:
+                counters = multiprocessing.get_context("spawn").Array("q", len(self.FIELDS))
+                counters[:] = self.counters
+                self.counters = counters
+                self.shared = True
+            return self.counters
+    
+    def attach(self, counters) -> None:
+        """Report into another process's counters"""
+        with self._lock:
+            self.counters = counters
+            self.shared = True
+    
+    def increment(self, field: str, amount: int = 1) -> None:
+        index = self.FIELDS.index(field)
+        with self._lock:
+            if not self.shared:
+                self.counters[index] += amount
+                return
+        with self.counters.get_lock():
+            self.counters[index] += amount
+    
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            if not self.shared:
+                return dict(zip(self.FIELDS, self.counters))
+        with self.counters.get_lock():
+            return dict(zip(self.FIELDS, self.counters[:]))
+
+
+class OCRPageCache:
+    """
+    LRU cache of OCR results keyed by a hash of the preprocessed page image
+    
+    Re-exported scans (different PDF bytes, same pages) and repeated pages
+    such as letterheads render to identical images, so their text can be
+    reused without running Tesseract again. Per process and thread-safe.
+    """
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+    
+    def key(self, image: 'Image.Image', settings: str) -> str:
+        """SHA-256 of the image pixels, size and mode plus the OCR settings"""
+        digest = hashlib.sha256(settings.encode())
+        digest.update(f"{image.mode}:{image.size[0]}x{image.size[1]}".encode())
+        digest.update(image.tobytes())
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """Return (text, confidence) for a page image, or None on miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+    
+    def put(self, key: str, text: str, confidence: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (text, confidence)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class OCRBusyError(Exception):
+    """Raised when the OCR queue is full or the wait for an OCR slot timed out"""
+    pass
+
+
+def _process_alive(pid: int) -> bool:
+    """Whether a process exists and has not exited (zombies count as dead)"""
+    if os.name == "nt":
+        # os.kill() would terminate the process; never reclaim there
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    try:
+        with open(f"/proc/{pid}/stat") as stat:
+            return stat.read().rsplit(")", 1)[-1].split()[0] != "Z"
+    except (OSError, IndexError):
+        return True
+
+
+class OCRAdmission:
+    """
+    Global limit on concurrent OCR runs, with a bounded wait queue
+    
+    Each slot and queue place records the PID of the process holding it,
+    and places held by a process that died (e.g. an OOM-killed analysis
+    worker) are reclaimed, so a crash cannot leak capacity. Process-local
+    until share(): the server process then moves the tables to shared
+    memory and hands them to the analysis pool (see attach()).
+    """
+    
+    FREE = 0
+    
+    # How often a queued run checks for a free slot
+    POLL_SECONDS = 0.05
+    
+    def __init__(self, max_concurrent: int, max_waiting: int, wait_timeout: float):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_waiting = max(0, max_waiting)
+        self.wait_timeout = wait_timeout
+        self.owners: Any = [self.FREE] * self.max_concurrent
+        self.waiters: Any = [self.FREE] * self.max_waiting
+        self.shared = False
+        self._lock = threading.Lock()
+    
+    def share(self) -> Tuple[Any, Any]:
+        """Move the slot and queue tables to shared memory (once) and return them"""
+        with self._lock:
+            if not self.shared:
+                ctx = multiprocessing.get_context("spawn")
+                owners = ctx.Array("q", self.max_concurrent)
+                owners[:] = self.owners
+                waiters = ctx.Array("q", self.max_waiting, lock=False)
+                waiters[:] = self.waiters
+                self.owners, self.waiters = owners, waiters
+                self.shared = True
+            return self.owners, self.waiters
+    
+    def attach(self, owners, waiters) -> None:
+        """Share another process's slot and queue tables"""
+        with self._lock:
+            self.owners, self.waiters = owners, waiters
+            self.shared = True
+    
+    @contextmanager
+    def _locked(self):
+        # Both tables are guarded by the slot table's lock once shared
+        self._lock.acquire()
+        if not self.shared:
+            try:
+                yield
+            finally:
+                self._lock.release()
+            return
+        self._lock.release()
+        with self.owners.get_lock():
+            yield
+    
+    def _take(self, waiting: bool) -> Optional[int]:
+        """Claim a free (or reclaimed) place for this process; None if all are held"""
+        pid = os.getpid()
+        with self._locked():
+            table = self.waiters if waiting else self.owners
+            for index in range(len(table)):
+                owner = table[index]
+                if owner == self.FREE or (owner != pid and not _process_alive(owner)):
+                    table[index] = pid
+                    return index
+        return None
+    
+    def _free(self, waiting: bool, index: int) -> None:
+        with self._locked():
+            table = self.waiters if waiting else self.owners
+            table[index] = self.FREE
+    
+    def acquire(self, wait: bool = True) -> int:
+        """
+        Take one OCR slot
+        
+        Args:
+            wait: Queue for a slot when none is free (False = fail at once)
+        
+        Returns:
+            Slot index, to pass to release() (or slot(held=...))
+        
+        Raises:
+            OCRBusyError: If max_waiting runs are already queued, or no
+                slot frees up within wait_timeout seconds (or at once
+                when `wait` is False)
+        """
+        index = self._take(waiting=False)
+        if index is not None:
+            return index
+        if not wait:
+            raise OCRBusyError("No free OCR slot")
+        
+        place = self._take(waiting=True)
+        if place is None:
+            raise OCRBusyError("OCR queue is full")
+        try:
+            deadline = time.monotonic() + self.wait_timeout
+            while True:
+                index = self._take(waiting=False)
+                if index is not None:
+                    return index
+                if time.monotonic() >= deadline:
+                    raise OCRBusyError("Timed out waiting for an OCR slot")
+                time.sleep(self.POLL_SECONDS)
+        finally:
+            self._free(True, place)
+    
+    def release(self, index: int) -> None:
+        self._free(False, index)
+    
+    @contextmanager
+    def slot(self, wait: bool = True, held: Optional[int] = None):
+        """
+        Hold one OCR slot for the duration of a run
+        
+        Args:
+            wait: See acquire()
+            held: Slot this process already acquired (e.g. handed over by
+                a speculative run), released at the end instead of
+                taking another one
+        """
+        index = self.acquire(wait) if held is None else held
+        try:
+            yield index
+        finally:
+            self.release(index)
+    
+    def reclaim(self) -> int:
+        """Free the slots and queue places of dead processes; returns how many"""
+        reclaimed = 0
+        with self._locked():
+            for table in (self.owners, self.waiters):
+                for index in range(len(table)):
+                    owner = table[index]
+                    if owner != self.FREE and not _process_alive(owner):
+                        table[index] = self.FREE
+                        reclaimed += 1
+        return reclaimed
+    
+    def stats(self) -> Dict[str, Any]:
+        self.reclaim()
+        with self._locked():
+            running = sum(1 for owner in self.owners[:] if owner != self.FREE)
+            waiting = sum(1 for owner in self.waiters[:] if owner != self.FREE)
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_waiting": self.max_waiting,
+            "wait_timeout_seconds": self.wait_timeout,
+            "running": running,
+            "waiting": waiting,
+        }
+
+
+class SpeculativeOCR:
+    """
+    OCR of a page started before knowing whether OCR will be needed
+    
+    Created by OCRService.start_speculative_ocr(), holding the OCR slot it
+    runs under. Pass it to the extract_*_with_ocr call, which takes over
+    the page and the slot, or cancel() it when the text layer turns out to
+    be sufficient. Either way the page may still be read in the
+    background for a moment: keep the document it reads open until
+    add_done_callback() fires.
+    """
+    
+    def __init__(self, service: "OCRService", page_number: int, slot: int):
+        self.service = service
+        self.page_number = page_number
+        self.slot = slot
+        self.future: Any = None
+        self.cancelled = threading.Event()
+        self._settled = False
+    
+    def handoff(self) -> Tuple[Dict[int, Dict[str, Any]], Dict[int, Any], Optional[int]]:
+        """
+        Hand the page and its OCR slot over to the OCR run
+        
+        Returns:
+            Tuple of ({page: result} if already read, {page: future} if
+            still being read, slot index now owned by the caller); the
+            dicts are empty if the page could not be read (it is then
+            read again under the same slot), and the slot is None once
+            the speculative OCR was handed off or cancelled
+        """
+        if self._settled:
+            return {}, {}, None
+        self._settled = True
+        
+        if not self.future.done():
+            self.service.metrics.increment("speculative_used")
+            return {}, {self.page_number: self.future}, self.slot
+        try:
+            page = self.future.result()
+        except Exception:
+            page = None
+        if page is None:
+            return {}, {}, self.slot
+        self.service.metrics.increment("speculative_used")
+        return {self.page_number: page}, {}, self.slot
+    
+    def add_done_callback(self, callback: Callable[[], None]) -> None:
+        """Call `callback` once the background OCR has stopped (at once if it has)"""
+        self.future.add_done_callback(lambda _: callback())
+    
+    def cancel(self) -> None:
+        """Drop the speculative work (no-op once handed off)"""
+        if self._settled:
+            return
+        self._settled = True
+        # Not started yet: never runs; running: its pdftoppm/tesseract
+        # child is killed (see OCRService._kill_when_stopped). The slot is
+        # freed once it has stopped.
+        self.cancelled.set()
+        self.future.cancel()
+        self.future.add_done_callback(lambda _: self.service.admission.release(self.slot))
+        self.service.metrics.increment("speculative_cancelled")
+
+
 class OCRService:
     """
     Local OCR Service for scanned PDF processing
@@ -33,8 +399,33 @@ class OCRService:
     - Image preprocessing for better accuracy
     - Text cleanup and deduplication
     - Confidence scoring
-    - Hard timeout protection (30 seconds)
+    - Hard timeout protection (30 seconds): poppler/tesseract child
+      processes still running at the deadline are killed
     - Max 5 pages to prevent overload
+    - Pages are rasterized and recognized in parallel, so a multi-page
+      scan takes roughly as long as its slowest page
+    - Pages are rendered in grayscale one at a time (or a small window in
+      parallel) within a per-request memory ceiling
+    - Adaptive resolution: a fast low-DPI pass first, with only
+      low-confidence pages re-read at full DPI
+    - Per-page hybrid mode: only pages without a usable text layer are
+      OCR'd and stitched with the text of the others
+    - Admission control: a global cap on concurrent OCR runs with a
+      bounded wait queue; overflow is rejected (OCRBusyError) or degraded
+      to the standard text
+    - Page-image cache: pages whose preprocessed image was already read
+      (re-exported scans, repeated letterhead pages) skip Tesseract
+    - Optional NumPy preprocessing (contrast normalization, Otsu or
+      adaptive binarization, deskew) in place of the PIL filter chain
+    - Numeric confidence from Tesseract's word table, per page and per
+      document, and early stop once the pages read so far already hold a
+      confident, complete resume
+    - Contact-band mode: a good text-layer resume that only lacks an
+      email or phone gets just the header of page 1 OCR'd
+    - Speculative mode: page 1 of a likely scan is OCR'd while the
+      standard text is still being extracted, and reused if OCR is needed
+    - Optional warm in-process Tesseract (tesserocr) instead of one
+      tesseract process per page, with pytesseract as the fallback
     """
     
     # OCR Quality thresholds
@@ -44,12 +435,147 @@ class OCRService:
     OCR_TIMEOUT_SECONDS = 30
     OCR_DPI = 300
     
+    # Per-page hybrid extraction: a "mixed" page (see PdfDocument.page_kind)
+    # is OCR'd only when its text layer is this short
+    MIN_PAGE_TEXT_LENGTH = 200
+    
+    # Rasterization memory: estimated peak bytes per grayscale pixel of a
+    # page (render plus preprocessing copies), and the lowest DPI a page
+    # is reduced to in order to fit the per-request memory ceiling
+    PAGE_BYTES_PER_PIXEL = 3
+    MIN_OCR_DPI = 150
+    
+    # Adaptive resolution: pages are first read at OCR_FAST_DPI and only
+    # re-read at OCR_DPI when Tesseract's mean word confidence is low
+    OCR_FAST_DPI = 200
+    OCR_ESCALATE_CONFIDENCE = 75
+    
+    # Confidence labels from the word-weighted mean Tesseract confidence;
+    # output shorter than MIN_CONFIDENT_WORDS is always "low"
+    HIGH_CONFIDENCE = 80
+    MEDIUM_CONFIDENCE = 60
+    MIN_CONFIDENT_WORDS = 50
+    
+    # Early stop: remaining pages are skipped once the pages read so far
+    # reach this confidence, hold contact details, at least MIN_TEXT_LENGTH
+    # characters and section headings (lines, as the parser finds them) for
+    # all of EARLY_STOP_SECTIONS, and end in one of EARLY_STOP_CLOSING_SECTIONS.
+    # Text ending in experience or projects most likely continues overleaf.
+    EARLY_STOP_CONFIDENCE = 85
+    EARLY_STOP_SECTIONS = ('experience', 'education', 'skills')
+    EARLY_STOP_CLOSING_SECTIONS = ('education', 'certifications')
+    
+    # Contact-band OCR: share of page 1 (from the top) that is rendered
+    # when only the contact details are missing, and its time limit
+    CONTACT_BAND_FRACTION = 0.2
+    CONTACT_OCR_TIMEOUT_SECONDS = 10
+    
+    # Renders narrower than UPSCALE_MIN_WIDTH are upscaled to it, unless
+    # they were rendered at UPSCALE_MAX_DPI or more (enough pixels per glyph)
+    UPSCALE_MIN_WIDTH = 1500
+    UPSCALE_MAX_DPI = 200
+    
+    # Tesseract settings (part of the page-image cache key)
+    TESSERACT_LANG = 'eng'
+    TESSERACT_CONFIG = '--oem 3 --psm 6'
+    
+    # How often a running pdftoppm/tesseract child is checked against the
+    # deadline and the run's cancellation
+    KILL_POLL_SECONDS = 0.05
+    
     # Email and phone patterns for quality detection
     EMAIL_PATTERN = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
     PHONE_PATTERN = r'(?:\+?1[-.\s]?)?(?:\(?\d{3}\)?[-.\s]?)?\d{3}[-.\s]?\d{4}|\+\d{1,3}[-.\s]?\d{6,14}'
     
-    def __init__(self):
+    def __init__(
+        self,
+        page_workers: Optional[int] = None,
+        max_memory_bytes: Optional[int] = None,
+        max_concurrent: Optional[int] = None,
+        max_waiting: int = 4,
+        wait_timeout: float = 10,
+        degrade_when_busy: bool = False,
+        page_cache_entries: int = 256,
+        preprocessor: Optional[NumpyPreprocessor] = None,
+        early_stop: bool = True,
+        speculative: bool = True,
+        engine: Optional[TesserocrEngine] = None
+    ):
+        """
+        Args:
+            page_workers: Pages processed at once (default: one per
+                available CPU, up to MAX_OCR_PAGES; 1 = sequential)
+            max_memory_bytes: Rasterization memory ceiling per request
+                (None = unlimited)
+            max_concurrent: OCR runs allowed at once (default: half the
+                available CPUs, at least 1)
+            max_waiting: OCR runs allowed to wait for a slot
+            wait_timeout: Seconds a run may wait for a slot
+            degrade_when_busy: Fall back to the standard text instead of
+                raising OCRBusyError when no slot is available
+            page_cache_entries: OCR'd page images remembered per process
+                (0 = no page cache)
+            preprocessor: NumPy preprocessing pipeline (None = the PIL
+                filter chain)
+            early_stop: Skip the remaining pages of a fully scanned PDF
+                once enough confident text was read
+            speculative: Allow start_speculative_ocr()
+            engine: Warm in-process Tesseract (None = a tesseract process
+                per page through pytesseract, also the fallback if the
+                engine cannot be initialized)
+        """
         self.ocr_available = OCR_AVAILABLE
+        self.max_memory_bytes = max_memory_bytes
+        self.metrics = OCRMetrics()
+        if max_concurrent is None:
+            max_concurrent = max(1, available_cpus() // 2)
+        self.admission = OCRAdmission(max_concurrent, max_waiting, wait_timeout)
+        self.degrade_when_busy = degrade_when_busy
+        self.page_cache = OCRPageCache(page_cache_entries)
+        self.preprocessor = preprocessor
+        self.early_stop = early_stop
+        self.speculative = speculative
+        self.engine = engine
+        # Pages are piped straight out of pdftoppm, and into tesseract,
+        # when they are on PATH (their processes can then be killed on cancel)
+        self.pdftoppm_path = shutil.which("pdftoppm")
+        self.tesseract_path = (
+            shutil.which(pytesseract.pytesseract.tesseract_cmd) if OCR_AVAILABLE else None
+        )
+        if page_workers is None:
+            page_workers = min(self.MAX_OCR_PAGES, available_cpus())
+        self.page_workers = max(1, page_workers)
+        self._page_executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        
+        if self.page_workers > 1:
+            # One Tesseract thread per page: parallelism comes from the
+            # page pool, and OpenMP threads on top would oversubscribe cores.
+            # Inherited by the tesseract subprocesses pytesseract starts,
+            # and read by the in-process engine when it is first loaded.
+            os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    
+    def shared_state(self) -> Tuple[Any, ...]:
+        """
+        Shared-memory metrics and admission state, for pool workers
+        
+        Created on the first call (in the server process that starts the
+        pool), so processes that only run OCR locally allocate none.
+        """
+        return (self.metrics.share(),) + self.admission.share()
+    
+    def attach_shared_state(self, state: Tuple[Any, ...]) -> None:
+        """Use the metrics and OCR limit of the process that created `state`"""
+        counters, owners, waiters = state
+        self.metrics.attach(counters)
+        self.admission.attach(owners, waiters)
+    
+    def stats(self) -> Dict[str, Any]:
+        stats = self.metrics.snapshot()
+        stats["admission"] = self.admission.stats()
+        stats["page_cache_entries"] = self.page_cache.max_entries
+        stats["engine"] = self.engine.name if self.engine is not None else "pytesseract"
+        return stats
     
     def is_available(self) -> bool:
         """Check if OCR dependencies are available"""
@@ -97,109 +623,628 @@ class OCRService:
         
         return False
     
+    def needs_contact_ocr(
+        self,
+        text: str,
+        email: Optional[str] = None,
+        phone: Optional[str] = None
+    ) -> bool:
+        """
+        Is only contact information missing from an otherwise usable text?
+        
+        True when the text passes the length and word-count checks of
+        needs_ocr() but has no email or no phone - typically a phone left
+        out of the text layer or an email rendered as an image/icon link.
+        
+        Args:
+            text: Extracted text from pypdf
+            email: Detected email (if any)
+            phone: Detected phone (if any)
+        """
+        if len(text.strip()) < self.MIN_TEXT_LENGTH or len(text.split()) < self.MIN_WORD_COUNT:
+            return False
+        has_email = bool(email or re.search(self.EMAIL_PATTERN, text))
+        has_phone = bool(phone or re.search(self.PHONE_PATTERN, text))
+        return not (has_email and has_phone)
+    
+    def extract_contact_with_ocr(
+        self,
+        pdf_source: DocumentSource,
+        pdf: Optional[PdfDocument] = None
+    ) -> Optional[str]:
+        """
+        OCR only the header band of page 1, where contact details live
+        
+        The page is cropped (via its crop box) before rendering, so just
+        the top CONTACT_BAND_FRACTION is rasterized and recognized.
+        
+        Args:
+            pdf_source: Path to the PDF file or its bytes
+            pdf: Already-opened document (skips re-parsing the PDF)
+            
+        Returns:
+            Cleaned OCR text of the band, or None if OCR was unavailable,
+            busy or failed (the text layer is kept either way)
+        """
+        if not self.ocr_available:
+            return None
+        
+        try:
+            with self._opened(pdf_source, pdf) as pdf:
+                band = self._header_band_pdf(pdf)
+            with self.admission.slot():
+                self.metrics.increment("contact_runs")
+                with source_path(band, suffix=".pdf") as band_path:
+                    deadline = time.monotonic() + self.CONTACT_OCR_TIMEOUT_SECONDS
+                    page = self._read_page(
+                        band_path, 1, self.OCR_DPI, deadline, threading.Event(),
+                        use_cropbox=True
+                    )
+            if page is None:
+                return None
+            return self._clean_ocr_text(page["text"])
+            
+        except OCRBusyError:
+            # Cheap to do without: the standard text is still used
+            self.metrics.increment("degraded_busy")
+            return None
+        except TimeoutError:
+            return None
+        except Exception as e:
+            # Log error but don't crash
+            print(f"OCR Error: {str(e)}")
+            return None
+    
+    def _header_band_pdf(self, pdf: PdfDocument) -> bytes:
+        """Page 1 alone, its crop box reduced to the visual top band"""
+        from pypdf import PdfWriter
+        from pypdf.generic import RectangleObject
+        
+        writer = PdfWriter()
+        # add_page() copies the page, so the request's document is untouched
+        page = writer.add_page(pdf.reader.pages[0])
+        box = page.cropbox
+        left, bottom = float(box.left), float(box.bottom)
+        right, top = float(box.right), float(box.top)
+        fraction = self.CONTACT_BAND_FRACTION
+        
+        # The band is at the top of the page as displayed
+        rotation = (page.get('/Rotate') or 0) % 360
+        if rotation == 90:
+            right = left + (right - left) * fraction
+        elif rotation == 180:
+            top = bottom + (top - bottom) * fraction
+        elif rotation == 270:
+            left = right - (right - left) * fraction
+        else:
+            bottom = top - (top - bottom) * fraction
+        page.cropbox = RectangleObject((left, bottom, right, top))
+        
+        output = io.BytesIO()
+        writer.write(output)
+        return output.getvalue()
+    
+    def start_speculative_ocr(
+        self,
+        pdf_source: DocumentSource,
+        page_number: int = 1,
+        pdf: Optional[PdfDocument] = None
+    ) -> Optional[SpeculativeOCR]:
+        """
+        Start OCR of one page in the background, ahead of the OCR decision
+        
+        Only runs when an OCR slot is free right away. The slot is handed
+        over to the request's own OCR run (see SpeculativeOCR.handoff()),
+        so the request never waits for a second one.
+        
+        Args:
+            pdf_source: Path to the PDF file or its bytes
+            page_number: 1-based page to read
+            pdf: Already-opened document, whose materialized path the
+                OCR run then shares; keep it open until the speculative
+                OCR is done (see SpeculativeOCR.add_done_callback())
+            
+        Returns:
+            Handle to pass to the OCR call or cancel, or None if OCR is
+            unavailable, speculation is disabled or no OCR slot is free
+        """
+        if not self.ocr_available or not self.speculative:
+            return None
+        owned = pdf is None
+        if owned:
+            try:
+                pdf = PdfDocument(pdf_source)
+            except Exception:
+                return None
+        try:
+            slot = self.admission.acquire(wait=False)
+        except OCRBusyError:
+            if owned:
+                pdf.close()
+            return None
+        self.metrics.increment("speculative_started")
+        dpis, _ = self._plan_rasterization(self._get_page_sizes(pdf, [page_number]))
+        speculative = SpeculativeOCR(self, page_number, slot)
+        speculative.future = self._get_page_executor().submit(
+            self._speculative_page, pdf, speculative, dpis[0]
+        )
+        if owned:
+            speculative.add_done_callback(pdf.close)
+        return speculative
+    
+    def _speculative_page(
+        self,
+        pdf: PdfDocument,
+        speculative: SpeculativeOCR,
+        dpi: int
+    ) -> Optional[Dict[str, Any]]:
+        # Runs under speculative.slot, released by whoever ends up owning it
+        deadline = time.monotonic() + self.OCR_TIMEOUT_SECONDS
+        return self._ocr_page(
+            pdf.path(), speculative.page_number, dpi, deadline, speculative.cancelled
+        )
+    
     def extract_text_with_ocr(
         self, 
-        pdf_path: str,
-        max_pages: Optional[int] = None
-    ) -> Tuple[Optional[str], str, str]:
+        pdf_source: DocumentSource,
+        max_pages: Optional[int] = None,
+        page_count: Optional[int] = None,
+        speculative: Optional[SpeculativeOCR] = None,
+        pdf: Optional[PdfDocument] = None
+    ) -> Tuple[Optional[str], str, str, Dict[str, Any]]:
         """
         Extract text from PDF using Tesseract OCR
         
         Args:
-            pdf_path: Path to the PDF file
+            pdf_source: Path to the PDF file or its bytes
             max_pages: Maximum pages to OCR (default: MAX_OCR_PAGES)
+            page_count: Known page count (skips re-opening the PDF)
+            speculative: Page already being OCR'd, reused instead of
+                reading it again
+            pdf: Already-opened document (page sizes and the path handed
+                to poppler are reused instead of re-parsing the PDF)
             
         Returns:
-            Tuple of (extracted_text, parsing_method, ocr_confidence)
+            Tuple of (extracted_text, parsing_method, ocr_confidence, ocr_details)
             - extracted_text: OCR text or None if failed
             - parsing_method: "ocr" | "ocr_unavailable"
             - ocr_confidence: "low" | "medium" | "high"
+            - ocr_details: Run metadata (see _ocr_details), empty if failed
         """
         if not self.ocr_available:
-            return None, "ocr_unavailable", "low"
+            return None, "ocr_unavailable", "low", {}
         
         max_pages = max_pages or self.MAX_OCR_PAGES
+        if page_count is None:
+            page_count = pdf.page_count if pdf is not None else self.get_pdf_page_count(pdf_source)
+        if page_count:
+            max_pages = min(max_pages, page_count)
         
         try:
-            # Run OCR with timeout protection
-            result = self._run_ocr_with_timeout(pdf_path, max_pages)
+            page_numbers = list(range(1, max_pages + 1))
+            enough = self._has_enough_text if self.early_stop else None
+            with self._opened(pdf_source, pdf) as pdf:
+                pages = self._ocr_pages(pdf, page_numbers, enough, speculative)
             
-            if result is None:
-                return None, "ocr_unavailable", "low"
+            if pages is None:
+                return None, "ocr_unavailable", "low", {}
             
-            extracted_text, page_count = result
+            extracted_text = '\n\n'.join(page["text"] for page in pages if page is not None)
             
             # Clean the OCR output
             cleaned_text = self._clean_ocr_text(extracted_text)
             
             # Calculate confidence
-            confidence = self._calculate_ocr_confidence(cleaned_text)
+            details = self._ocr_details(page_numbers, pages)
+            confidence = self._calculate_ocr_confidence(
+                cleaned_text, details["ocr_mean_confidence"]
+            )
+            
+            return cleaned_text, "ocr", confidence, details
+            
+        except OCRBusyError:
+            if not self.degrade_when_busy:
+                self.metrics.increment("rejected_busy")
+                raise
+            self.metrics.increment("degraded_busy")
+            return None, "ocr_unavailable", "low", {}
+        except TimeoutError:
+            return None, "ocr_unavailable", "low", {}
+        except Exception as e:
+            # Log error but don't crash
+            print(f"OCR Error: {str(e)}")
+            return None, "ocr_unavailable", "low", {}
+    
+    def pages_needing_ocr(self, pdf: PdfDocument) -> List[int]:
+        """
+        Pages without a usable text layer (1-based)
+        
+        A page needs OCR when it is structurally scanned (shows no text),
+        or when its pypdf text is shorter than MIN_PAGE_TEXT_LENGTH and it
+        is a "mixed" page (mostly an image) or yields no text at all.
+        
+        Args:
+            pdf: Opened PDF document
+            
+        Returns:
+            Page numbers to OCR, in page order
+        """
+        pages = []
+        for index, text in enumerate(pdf.page_texts):
+            kind = pdf.page_kind(index)
+            length = len(text.strip())
+            if kind == PdfDocument.PAGE_SCANNED:
+                pages.append(index + 1)
+            elif length < self.MIN_PAGE_TEXT_LENGTH and (length == 0 or kind == PdfDocument.PAGE_MIXED):
+                pages.append(index + 1)
+        return pages
+    
+    def extract_pages_with_ocr(
+        self,
+        pdf_source: DocumentSource,
+        page_texts: List[str],
+        ocr_pages: List[int],
+        speculative: Optional[SpeculativeOCR] = None,
+        pdf: Optional[PdfDocument] = None
+    ) -> Tuple[Optional[str], str, str, Dict[str, Any]]:
+        """
+        OCR only the given pages and stitch them with the text layer of the rest
+        
+        Args:
+            pdf_source: Path to the PDF file or its bytes
+            page_texts: pypdf text of every page
+            ocr_pages: 1-based pages to replace with OCR text
+            speculative: Page already being OCR'd (used if it is one of
+                `ocr_pages`, cancelled otherwise)
+            pdf: Already-opened document (see extract_text_with_ocr)
+            
+        Returns:
+            Tuple of (extracted_text, parsing_method, ocr_confidence,
+            ocr_details), as for extract_text_with_ocr
+        """
+        if not self.ocr_available:
+            return None, "ocr_unavailable", "low", {}
+        
+        try:
+            with self._opened(pdf_source, pdf) as pdf:
+                pages = self._ocr_pages(pdf, ocr_pages, speculative=speculative)
+            
+            if pages is None:
+                return None, "ocr_unavailable", "low", {}
+            
+            # Stitch in page order: cleaned OCR text for scanned pages,
+            # the original text layer for the others
+            stitched = list(page_texts)
+            for page_number, page in zip(ocr_pages, pages):
+                stitched[page_number - 1] = self._clean_ocr_text(page["text"] if page else "")
+            combined = "".join(text + "\n" for text in stitched if text)
             
-            return cleaned_text, "ocr", confidence
+            details = self._ocr_details(ocr_pages, pages)
+            confidence = self._calculate_ocr_confidence(
+                combined, details["ocr_mean_confidence"]
+            )
             
+            return combined, "ocr", confidence, details
+            
+        except OCRBusyError:
+            if not self.degrade_when_busy:
+                self.metrics.increment("rejected_busy")
+                raise
+            self.metrics.increment("degraded_busy")
+            return None, "ocr_unavailable", "low", {}
         except TimeoutError:
-            return None, "ocr_unavailable", "low"
+            return None, "ocr_unavailable", "low", {}
         except Exception as e:
             # Log error but don't crash
             print(f"OCR Error: {str(e)}")
-            return None, "ocr_unavailable", "low"
+            return None, "ocr_unavailable", "low", {}
+    
+    def _ocr_details(
+        self,
+        page_numbers: List[int],
+        pages: List[Optional[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Run metadata reported with the analysis
+        
+        - ocr_tier: "fast" when every page was accepted from the low-DPI
+          pass, "high" when every page was re-read at full DPI, else "mixed"
+        - ocr_mean_confidence: Tesseract word confidence (0-100) averaged
+          over every recognized word of the document
+        - ocr_page_confidences: [{"page", "confidence"}] for each page read
+        """
+        read = [
+            (page_number, page) for page_number, page in zip(page_numbers, pages)
+            if page is not None
+        ]
+        escalated = [page["escalated"] for _, page in read]
+        if escalated and all(escalated):
+            tier = "high"
+        elif any(escalated):
+            tier = "mixed"
+        else:
+            tier = "fast"
+        return {
+            "ocr_tier": tier,
+            "ocr_mean_confidence": self._mean_confidence([page for _, page in read]),
+            "ocr_page_confidences": [
+                {"page": page_number, "confidence": round(page["confidence"], 1)}
+                for page_number, page in read
+            ],
+        }
+    
+    def _mean_confidence(self, pages: List[Dict[str, Any]]) -> float:
+        """Mean word confidence across pages, weighted by their word counts"""
+        words = sum(page["words"] for page in pages)
+        if not words:
+            return 0.0
+        return round(sum(page["confidence"] * page["words"] for page in pages) / words, 1)
+    
+    def _has_enough_text(self, pages: List[Dict[str, Any]]) -> bool:
+        """
+        Early-stop policy: do the first pages already hold a confident,
+        complete resume (contact details, the main section headings, and
+        ending in a section that usually closes a resume)?
+        """
+        if self._mean_confidence(pages) < self.EARLY_STOP_CONFIDENCE:
+            return False
+        text = '\n'.join(page["text"] for page in pages)
+        if len(text) < self.MIN_TEXT_LENGTH:
+            return False
+        if not re.search(self.EMAIL_PATTERN, text) or not re.search(self.PHONE_PATTERN, text):
+            return False
+        headings = [heading for heading in map(section_heading, text.split('\n')) if heading]
+        if not set(self.EARLY_STOP_SECTIONS) <= set(headings):
+            return False
+        return headings[-1] in self.EARLY_STOP_CLOSING_SECTIONS
+    
+    @contextmanager
+    def _opened(
+        self,
+        pdf_source: DocumentSource,
+        pdf: Optional[PdfDocument]
+    ) -> Iterator[PdfDocument]:
+        """The caller's opened document, or one opened for this call only"""
+        if pdf is not None:
+            yield pdf
+            return
+        pdf = PdfDocument(pdf_source)
+        try:
+            yield pdf
+        finally:
+            pdf.close()
+    
+    def _ocr_pages(
+        self,
+        pdf: PdfDocument,
+        page_numbers: List[int],
+        enough: Optional[Callable[[List[Dict[str, Any]]], bool]] = None,
+        speculative: Optional[SpeculativeOCR] = None
+    ) -> Optional[List[Optional[Dict[str, Any]]]]:
+        """
+        OCR result of each requested page, in the order given
+        
+        Args:
+            pdf: Opened document
+            page_numbers: 1-based pages to process
+            enough: Early-stop check on the leading pages read so far;
+                once it passes, later pages are skipped (None results)
+            speculative: Page already being OCR'd; reused if requested
+                here (finished, or joined while the others are read) and
+                its OCR slot used for this run, cancelled otherwise
+        """
+        prefetched, running, held = {}, {}, None
+        if speculative is not None:
+            if speculative.page_number in page_numbers:
+                prefetched, running, held = speculative.handoff()
+            else:
+                speculative.cancel()
+        
+        results = dict(prefetched)
+        try:
+            leading = []
+            for page_number in page_numbers:
+                if page_number not in prefetched:
+                    break
+                leading.append(prefetched[page_number])
+            remaining = [page_number for page_number in page_numbers if page_number not in prefetched]
+            if remaining and enough is not None and leading and enough(leading):
+                self.metrics.increment("pages_skipped", len(remaining))
+                remaining = []
+            
+            if remaining:
+                # The early-stop check also counts the prefetched leading pages
+                stop_check = enough
+                if enough is not None and leading:
+                    stop_check = lambda pages: enough(leading + pages)
+                dpis, window = self._plan_rasterization(
+                    self._get_page_sizes(pdf, remaining)
+                )
+                with self.admission.slot(held=held):
+                    # Released by slot() from here on
+                    held = None
+                    pages = self._ocr_pages_admitted(
+                        pdf, remaining, dpis, window, stop_check, running
+                    )
+                results.update(zip(remaining, pages))
+        finally:
+            if held is not None:
+                self.admission.release(held)
+            if running:
+                # The run is over (or timed out): stop the joined page too
+                speculative.cancelled.set()
+        return [results.get(page_number) for page_number in page_numbers]
+    
+    def _ocr_pages_admitted(
+        self,
+        pdf: PdfDocument,
+        page_numbers: List[int],
+        dpis: List[int],
+        window: int,
+        enough: Optional[Callable[[List[Dict[str, Any]]], bool]],
+        running: Dict[int, Any]
+    ) -> Optional[List[Optional[Dict[str, Any]]]]:
+        self.metrics.increment("runs")
+        try:
+            # poppler needs a path - in-memory uploads are materialized
+            # (memfd/tmpfs) once per document and shared with the
+            # speculative run
+            pages = self._run_ocr_with_timeout(
+                pdf.path(), page_numbers, dpis, window, enough, running
+            )
+        except TimeoutError:
+            self.metrics.increment("timed_out")
+            raise
+        except Exception:
+            self.metrics.increment("failed")
+            raise
+        self.metrics.increment("completed")
+        self.metrics.increment("pages", sum(1 for page in pages if page is not None))
+        self.metrics.increment(
+            "pages_escalated", sum(1 for page in pages if page is not None and page["escalated"])
+        )
+        return pages
+    
+    def _get_page_sizes(
+        self,
+        pdf: PdfDocument,
+        page_numbers: List[int]
+    ) -> List[Tuple[float, float]]:
+        """Page sizes in points (US Letter where unreadable)"""
+        letter = (612.0, 792.0)
+        try:
+            return [pdf.page_size(page_number - 1) for page_number in page_numbers]
+        except Exception:
+            return [letter] * len(page_numbers)
+    
+    def _plan_rasterization(
+        self,
+        page_sizes: List[Tuple[float, float]]
+    ) -> Tuple[List[int], int]:
+        """
+        Fit page rendering into the per-request memory ceiling
+        
+        Each page is estimated at PAGE_BYTES_PER_PIXEL bytes per grayscale
+        pixel (render plus preprocessing copies). A page that alone exceeds
+        the ceiling is rendered at a lower DPI (not below MIN_OCR_DPI), and
+        the number of pages in flight is limited to what fits.
+        
+        Args:
+            page_sizes: (width, height) in points of each page
+            
+        Returns:
+            Tuple of (dpi per page, pages rendered at once)
+        """
+        dpis = []
+        largest = 0.0
+        for width, height in page_sizes:
+            square_inches = max(width * height / (72 * 72), 1.0)
+            dpi = self.OCR_DPI
+            page_bytes = square_inches * dpi * dpi * self.PAGE_BYTES_PER_PIXEL
+            if self.max_memory_bytes and page_bytes > self.max_memory_bytes:
+                fit = (self.max_memory_bytes / (square_inches * self.PAGE_BYTES_PER_PIXEL)) ** 0.5
+                dpi = max(self.MIN_OCR_DPI, int(fit))
+                page_bytes = square_inches * dpi * dpi * self.PAGE_BYTES_PER_PIXEL
+            dpis.append(dpi)
+            largest = max(largest, page_bytes)
+        
+        window = self.page_workers
+        if self.max_memory_bytes and largest:
+            window = min(window, int(self.max_memory_bytes // largest))
+        return dpis, max(1, window)
     
     def _run_ocr_with_timeout(
         self, 
         pdf_path: str, 
-        max_pages: int
-    ) -> Optional[Tuple[str, int]]:
+        page_numbers: List[int],
+        dpis: List[int],
+        window: int,
+        enough: Optional[Callable[[List[Dict[str, Any]]], bool]] = None,
+        running: Optional[Dict[int, Any]] = None
+    ) -> List[Optional[Dict[str, Any]]]:
         """
         Run OCR with a hard timeout to prevent hanging
         
+        Every pdftoppm/tesseract call gets the time left until the shared
+        deadline as its own timeout, so children still running when it
+        passes are killed (freeing their CPU and memory) instead of
+        finishing in the background; pages not yet started are cancelled.
+        
         Args:
             pdf_path: Path to PDF
-            max_pages: Maximum pages to process
+            page_numbers: 1-based pages to process
+            dpis: Highest render resolution allowed for each page
+            window: Pages rendered/recognized at once
+            enough: Early-stop check on the leading pages read so far;
+                once it passes, pages not yet started are skipped and
+                running ones keep their first-pass result
+            running: Futures of pages already being read (speculative
+                OCR), joined instead of starting those pages again
             
         Returns:
-            Tuple of (text, page_count) or None if timeout/error
+            OCR result of each page (see _ocr_page; None when skipped)
+            
+        Raises:
+            TimeoutError: If the deadline passed
         """
-        result = {"text": None, "pages": 0, "error": None}
+        deadline = time.monotonic() + self.OCR_TIMEOUT_SECONDS
+        cancelled = threading.Event()
+        stopped = threading.Event()
+        result = {"texts": None, "error": None}
+        futures = []
+        running = running or {}
+        
+        def should_stop(leading: List[Optional[Dict[str, Any]]]) -> bool:
+            if enough is not None and not stopped.is_set():
+                read = [page for page in leading if page is not None]
+                if read and enough(read):
+                    stopped.set()
+            return stopped.is_set()
         
         def ocr_worker():
             try:
-                # Convert PDF pages to images
-                images = convert_from_path(
-                    pdf_path,
-                    dpi=self.OCR_DPI,
-                    first_page=1,
-                    last_page=max_pages
-                )
-                
-                if len(images) > max_pages:
-                    # PDF has too many pages
-                    result["error"] = "too_many_pages"
-                    return
-                
-                all_text = []
-                
-                for i, image in enumerate(images[:max_pages]):
-                    # Preprocess image for better OCR
-                    processed_image = self._preprocess_image(image)
-                    
-                    # Run Tesseract OCR
-                    page_text = pytesseract.image_to_string(
-                        processed_image,
-                        lang='eng',
-                        config='--oem 3 --psm 6'
-                    )
-                    
-                    all_text.append(page_text)
-                    
-                    # Don't store images - privacy
-                    del processed_image
-                    del image
-                
-                result["text"] = '\n\n'.join(all_text)
-                result["pages"] = len(images)
+                if window > 1 and len(page_numbers) > 1:
+                    # Rasterize + recognize pages concurrently; pdftoppm and
+                    # tesseract run as subprocesses, so threads overlap fully.
+                    # At most `window` pages are in memory at once.
+                    executor = self._get_page_executor()
+                    for page_number, dpi in zip(page_numbers, dpis):
+                        if page_number in running:
+                            futures.append(running[page_number])
+                            continue
+                        in_flight = [future for future in futures if not future.done()]
+                        if len(in_flight) >= window:
+                            wait(in_flight, return_when=FIRST_COMPLETED)
+                        if futures and should_stop(self._leading_results(futures)):
+                            break
+                        futures.append(executor.submit(
+                            self._ocr_page, pdf_path, page_number, dpi, deadline, cancelled, stopped
+                        ))
+                    # Collected in page order regardless of completion order
+                    texts = []
+                    for index, future in enumerate(futures):
+                        texts.append(None if future.cancelled() else future.result())
+                        if should_stop(texts):
+                            for pending in futures[index + 1:]:
+                                pending.cancel()
+                    result["texts"] = texts
+                else:
+                    texts = []
+                    for page_number, dpi in zip(page_numbers, dpis):
+                        if should_stop(texts):
+                            break
+                        if page_number in running:
+                            texts.append(running[page_number].result(
+                                timeout=self._time_left(deadline, cancelled)
+                            ))
+                            continue
+                        texts.append(
+                            self._ocr_page(pdf_path, page_number, dpi, deadline, cancelled, stopped)
+                        )
+                    result["texts"] = texts
                 
             except Exception as e:
-                result["error"] = str(e)
+                result["error"] = e
         
         # Run OCR in a thread with timeout
         thread = threading.Thread(target=ocr_worker)
@@ -208,50 +1253,442 @@ class OCRService:
         thread.join(timeout=self.OCR_TIMEOUT_SECONDS)
         
         if thread.is_alive():
-            # Timeout occurred
+            # Timeout occurred - stop pages that haven't started yet; running
+            # children are killed
+            cancelled.set()
+            for future in futures:
+                future.cancel()
             raise TimeoutError("OCR processing exceeded timeout")
         
         if result["error"]:
-            if result["error"] == "too_many_pages":
-                return None
-            raise Exception(result["error"])
+            if isinstance(result["error"], TimeoutError):
+                raise result["error"]
+            raise Exception(str(result["error"]))
+        
+        # Pages skipped by the early stop (never started, or cancelled
+        # while queued) come back as None
+        texts = result["texts"]
+        skipped = len(page_numbers) - len(texts) + sum(1 for future in futures if future.cancelled())
+        if skipped:
+            self.metrics.increment("pages_skipped", skipped)
+        texts.extend([None] * (len(page_numbers) - len(texts)))
+        return texts
+    
+    def _leading_results(self, futures: List[Any]) -> List[Optional[Dict[str, Any]]]:
+        """Results of the pages finished so far without a gap before them"""
+        leading = []
+        for future in futures:
+            if not future.done() or future.cancelled() or future.exception() is not None:
+                break
+            leading.append(future.result())
+        return leading
+    
+    def _time_left(self, deadline: float, cancelled: threading.Event) -> float:
+        """Seconds until the OCR deadline; raises once it passed or was cancelled"""
+        remaining = deadline - time.monotonic()
+        if cancelled.is_set() or remaining <= 0:
+            raise TimeoutError("OCR processing exceeded timeout")
+        return remaining
+    
+    def _get_page_executor(self) -> ThreadPoolExecutor:
+        """Shared page pool, which also caps concurrent pages per process"""
+        with self._executor_lock:
+            if self._page_executor is None:
+                self._page_executor = ThreadPoolExecutor(
+                    max_workers=self.page_workers,
+                    thread_name_prefix="ocr-page"
+                )
+            return self._page_executor
+    
+    def _ocr_page(
+        self,
+        pdf_path: str,
+        page_number: int,
+        dpi: int,
+        deadline: float,
+        cancelled: threading.Event,
+        stopped: Optional[threading.Event] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Rasterize and OCR a single page, cheapest resolution first
         
-        if result["text"] is None:
+        The page is read at OCR_FAST_DPI; only if Tesseract's mean word
+        confidence comes back below OCR_ESCALATE_CONFIDENCE is it rendered
+        and read again at `dpi`, keeping the more confident result.
+        
+        Args:
+            pdf_path: Path to PDF
+            page_number: 1-based page number
+            dpi: Highest render resolution allowed
+            deadline: time.monotonic() value by which OCR must finish
+            cancelled: Set when the run was abandoned
+            stopped: Set once the run has read enough (early stop): the
+                page is skipped, or not re-read at full DPI
+            
+        Returns:
+            {"text", "confidence" (mean word confidence 0-100), "words",
+            "dpi", "escalated"}, or None if the page could not be rendered
+            or was skipped
+        """
+        if stopped is not None and stopped.is_set():
+            self.metrics.increment("pages_skipped")
+            return None
+        
+        fast_dpi = min(self.OCR_FAST_DPI, dpi)
+        page = self._read_page(pdf_path, page_number, fast_dpi, deadline, cancelled)
+        if page is None:
             return None
+        page["escalated"] = False
         
-        return result["text"], result["pages"]
+        low_confidence = page["confidence"] < self.OCR_ESCALATE_CONFIDENCE
+        if low_confidence and dpi > fast_dpi and not (stopped is not None and stopped.is_set()):
+            retry = self._read_page(pdf_path, page_number, dpi, deadline, cancelled)
+            if retry is not None and retry["confidence"] >= page["confidence"]:
+                page = retry
+            page["escalated"] = True
+        
+        return page
     
-    def _preprocess_image(self, image: 'Image.Image') -> 'Image.Image':
+    def _read_page(
+        self,
+        pdf_path: str,
+        page_number: int,
+        dpi: int,
+        deadline: float,
+        cancelled: threading.Event,
+        use_cropbox: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Render one page at `dpi` (only its crop box if asked) and recognize it"""
+        image = self._render_page(pdf_path, page_number, dpi, deadline, cancelled, use_cropbox)
+        if image is None:
+            return None
+        
+        # Hand the render over without keeping a reference, so each
+        # preprocessing step frees the previous copy once the next exists
+        image = self._preprocess_image(image, dpi)
+        
+        # Identical page images (re-uploads, repeated pages) reuse their text
+        cache_key = None
+        if self.page_cache.enabled:
+            cache_key = self.page_cache.key(
+                image, f"{self.TESSERACT_LANG} {self.TESSERACT_CONFIG}"
+            )
+            cached = self.page_cache.get(cache_key)
+            if cached is not None:
+                del image
+                self.metrics.increment("page_cache_hits")
+                text, confidence = cached
+                return {"text": text, "confidence": confidence, "words": len(text.split()), "dpi": dpi}
+            self.metrics.increment("page_cache_misses")
+        
+        # Run Tesseract OCR (word boxes + confidences, one pass)
+        try:
+            data = self._recognize(image, deadline, cancelled)
+        finally:
+            # Don't store images - privacy (the cache keeps only a hash)
+            del image
+        
+        text, confidence = self._text_from_data(data)
+        if cache_key is not None:
+            self.page_cache.put(cache_key, text, confidence)
+        return {"text": text, "confidence": confidence, "words": len(text.split()), "dpi": dpi}
+    
+    def _render_page(
+        self,
+        pdf_path: str,
+        page_number: int,
+        dpi: int,
+        deadline: float,
+        cancelled: threading.Event,
+        use_cropbox: bool = False
+    ) -> Optional['Image.Image']:
+        """
+        Rasterize one page to 8-bit grayscale (a third of RGB)
+        
+        pdftoppm's PGM output is streamed through a pipe into the buffer
+        the returned image wraps: no temp files, no intermediate copies of
+        the page, and none of the pdfinfo/version-probe processes that
+        convert_from_path starts on every call. pdftoppm is killed at the
+        deadline or as soon as `cancelled` is set. Without pdftoppm on
+        PATH, convert_from_path is used instead (killed at the deadline only).
+        
+        Returns:
+            Grayscale PIL Image, or None if the page could not be rendered
+        
+        Raises:
+            TimeoutError: If the deadline passed or the run was cancelled
+        """
+        timeout = self._time_left(deadline, cancelled)
+        if self.pdftoppm_path is None:
+            try:
+                images = convert_from_path(
+                    pdf_path,
+                    dpi=dpi,
+                    first_page=page_number,
+                    last_page=page_number,
+                    grayscale=True,
+                    use_cropbox=use_cropbox,
+                    timeout=timeout
+                )
+            except PDFPopplerTimeoutError:
+                self.metrics.increment("processes_killed")
+                raise TimeoutError("OCR processing exceeded timeout")
+            return images.pop() if images else None
+        
+        command = [
+            self.pdftoppm_path, "-gray", "-r", str(dpi),
+            "-f", str(page_number), "-l", str(page_number)
+        ]
+        if use_cropbox:
+            command.append("-cropbox")
+        command.append(pdf_path)
+        
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        # Killing pdftoppm also ends the read (EOF)
+        try:
+            with self._kill_when_stopped(process, deadline, cancelled):
+                image = self._read_pgm(process.stdout)
+                process.wait()
+        finally:
+            process.stdout.close()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+        return image if process.returncode == 0 else None
+    
+    @contextmanager
+    def _kill_when_stopped(
+        self,
+        process: subprocess.Popen,
+        deadline: float,
+        cancelled: threading.Event
+    ):
+        """
+        Kill a child process still running at the deadline or once
+        `cancelled` is set, e.g. by SpeculativeOCR.cancel(), so its OCR
+        slot comes back right away
+        
+        Raises:
+            TimeoutError: On leaving the block, if the process was killed
+        """
+        killed = threading.Event()
+        finished = threading.Event()
+        
+        def watch():
+            while not finished.wait(self.KILL_POLL_SECONDS):
+                if cancelled.is_set() or time.monotonic() >= deadline:
+                    if process.poll() is None:
+                        killed.set()
+                        process.kill()
+                    return
+        
+        watcher = threading.Thread(target=watch, name="ocr-kill", daemon=True)
+        watcher.start()
+        try:
+            yield
+        finally:
+            finished.set()
+            watcher.join()
+        if killed.is_set():
+            self.metrics.increment("processes_killed")
+            raise TimeoutError("OCR processing exceeded timeout")
+    
+    def _read_pgm(self, stream: Any) -> Optional['Image.Image']:
+        """Image over the pixels of a binary 8-bit PGM stream; None if truncated"""
+        # pdftoppm writes "P5\n<width> <height>\n255\n", without comments
+        header = []
+        while len(header) < 4:
+            line = stream.readline()
+            if not line:
+                return None
+            header.extend(line.split())
+        if len(header) != 4 or header[0] != b"P5" or header[3] != b"255":
+            return None
+        width, height = int(header[1]), int(header[2])
+        
+        pixels = bytearray(width * height)
+        view = memoryview(pixels)
+        filled = 0
+        while filled < len(pixels):
+            count = stream.readinto(view[filled:])
+            if not count:
+                return None
+            filled += count
+        return Image.frombuffer('L', (width, height), pixels, 'raw', 'L', 0, 1)
+    
+    def _recognize(
+        self,
+        image: 'Image.Image',
+        deadline: float,
+        cancelled: threading.Event
+    ) -> Dict[str, List[Any]]:
+        """
+        Tesseract's word table for a page image, from the warm engine if set
+        
+        Otherwise a tesseract process reads the image from a pipe and is
+        killed at the deadline or as soon as `cancelled` is set. Without
+        tesseract on PATH pytesseract is called (killed at the deadline only).
+        
+        Raises:
+            TimeoutError: If the deadline passed or the run was cancelled
+        """
+        if self.engine is not None:
+            try:
+                data = self.engine.image_to_data(image, self._time_left(deadline, cancelled))
+            except TesseractEngineError as e:
+                print(f"OCR Error: Tesseract engine unavailable, using pytesseract: {str(e)}")
+                self.engine = None
+            else:
+                if data is None:
+                    raise TimeoutError("OCR processing exceeded timeout")
+                return data
+        
+        if self.tesseract_path is not None:
+            return self._run_tesseract(image, deadline, cancelled)
+        
+        try:
+            return pytesseract.image_to_data(
+                image,
+                lang=self.TESSERACT_LANG,
+                config=self.TESSERACT_CONFIG,
+                output_type=pytesseract.Output.DICT,
+                timeout=self._time_left(deadline, cancelled)
+            )
+        except RuntimeError as e:
+            if str(e) != 'Tesseract process timeout':
+                raise
+            self.metrics.increment("processes_killed")
+            raise TimeoutError("OCR processing exceeded timeout")
+    
+    def _run_tesseract(
+        self,
+        image: 'Image.Image',
+        deadline: float,
+        cancelled: threading.Event
+    ) -> Dict[str, List[Any]]:
+        """Word table from a tesseract process, as pytesseract.image_to_data returns it"""
+        self._time_left(deadline, cancelled)
+        # Uncompressed PGM on stdin, TSV on stdout: no temp files
+        page = io.BytesIO()
+        image.save(page, format="PPM")
+        command = [
+            self.tesseract_path, "stdin", "stdout", "-l", self.TESSERACT_LANG,
+            "-c", "tessedit_create_tsv=1", *shlex.split(self.TESSERACT_CONFIG)
+        ]
+        
+        process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        with self._kill_when_stopped(process, deadline, cancelled):
+            output, stderr = process.communicate(page.getbuffer())
+        if process.returncode:
+            message = stderr.decode(errors="replace").strip()
+            raise Exception(f"Tesseract failed ({process.returncode}): {message}")
+        return self._read_tsv(output.decode(errors="replace"))
+    
+    def _read_tsv(self, tsv: str) -> Dict[str, List[Any]]:
+        """Columns of Tesseract's TSV output; numbers as ints, the text as is"""
+        rows = [row.split('\t') for row in tsv.strip().split('\n')]
+        if len(rows) < 2:
+            return {}
+        header = rows.pop(0)
+        data = {column: [] for column in header}
+        for row in rows:
+            # The text cell of an empty word may be missing entirely
+            row += [''] * (len(header) - len(row))
+            for column, value in zip(header, row):
+                if column != 'text':
+                    try:
+                        value = int(float(value))
+                    except ValueError:
+                        pass
+                data[column].append(value)
+        return data
+    
+    def _text_from_data(self, data: Dict[str, List[Any]]) -> Tuple[str, float]:
+        """
+        Rebuild page text from Tesseract's word table
+        
+        Words are joined by spaces, lines by newlines and blocks/paragraphs
+        by a blank line, matching image_to_string's layout.
+        
+        Returns:
+            Tuple of (text, mean word confidence 0-100; 0 with no words)
+        """
+        lines = []
+        current_key = None
+        paragraph_key = None
+        words = []
+        confidences = []
+        
+        for index, word in enumerate(data.get("text", [])):
+            word = str(word).strip()
+            if not word:
+                continue
+            try:
+                conf = float(data["conf"][index])
+            except (KeyError, IndexError, TypeError, ValueError):
+                conf = -1
+            if conf >= 0:
+                confidences.append(conf)
+            
+            block = (data["block_num"][index], data["par_num"][index])
+            key = block + (data["line_num"][index],)
+            if key != current_key:
+                if words:
+                    lines.append(" ".join(words))
+                if paragraph_key is not None and block != paragraph_key:
+                    lines.append("")
+                words = []
+                current_key = key
+                paragraph_key = block
+            words.append(word)
+        
+        if words:
+            lines.append(" ".join(words))
+        
+        mean_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+        return "\n".join(lines), mean_confidence
+    
+    def _preprocess_image(self, image: 'Image.Image', dpi: int) -> 'Image.Image':
         """
         Preprocess image for better OCR accuracy
         
-        Steps:
+        Steps (PIL chain):
         1. Convert to grayscale
         2. Increase contrast
         3. Apply slight sharpening
         4. Resize if needed for clarity
         
+        With a NumPy preprocessor, steps 1-3 are replaced by its
+        normalization/binarization/deskew pipeline.
+        
         Args:
             image: PIL Image object
+            dpi: Resolution the page was rendered at
             
         Returns:
             Preprocessed PIL Image
         """
-        # Convert to grayscale
-        if image.mode != 'L':
-            image = image.convert('L')
-        
-        # Increase contrast
-        enhancer = ImageEnhance.Contrast(image)
-        image = enhancer.enhance(1.5)
-        
-        # Apply slight sharpening
-        image = image.filter(ImageFilter.SHARPEN)
+        if self.preprocessor is not None:
+            image = self.preprocessor.process(image)
+        else:
+            # Convert to grayscale
+            if image.mode != 'L':
+                image = image.convert('L')
+            
+            # Increase contrast
+            enhancer = ImageEnhance.Contrast(image)
+            image = enhancer.enhance(1.5)
+            
+            # Apply slight sharpening
+            image = image.filter(ImageFilter.SHARPEN)
         
-        # Resize if image is too small (improves OCR)
+        # Resize if image is too small (improves OCR) - not needed when
+        # the render resolution is already high enough
         width, height = image.size
-        if width < 1500:
-            scale = 1500 / width
+        if width < self.UPSCALE_MIN_WIDTH and dpi < self.UPSCALE_MAX_DPI:
+            scale = self.UPSCALE_MIN_WIDTH / width
             new_width = int(width * scale)
             new_height = int(height * scale)
             image = image.resize((new_width, new_height), Image.LANCZOS)
@@ -332,99 +1769,93 @@ class OCRService:
         
         return result.strip()
     
-    def _calculate_ocr_confidence(self, text: str) -> str:
+    def _calculate_ocr_confidence(self, text: str, mean_confidence: float) -> str:
         """
-        Calculate OCR confidence level based on extracted content
-        
-        Criteria:
-        - Word count
-        - Email detected
-        - Phone detected
-        - Skills/keywords detected
+        Confidence level from Tesseract's own word confidences
         
         Args:
             text: Cleaned OCR text
+            mean_confidence: Word-weighted mean Tesseract confidence (0-100)
             
         Returns:
             "low" | "medium" | "high"
         """
-        if not text:
+        if not text or len(text.split()) < self.MIN_CONFIDENT_WORDS:
             return "low"
-        
-        score = 0
-        
-        # Word count scoring
-        word_count = len(text.split())
-        if word_count >= 300:
-            score += 3
-        elif word_count >= 150:
-            score += 2
-        elif word_count >= 50:
-            score += 1
-        
-        # Email detected
-        if re.search(self.EMAIL_PATTERN, text):
-            score += 2
-        
-        # Phone detected
-        if re.search(self.PHONE_PATTERN, text):
-            score += 1
-        
-        # Skills/keywords detected
-        skill_keywords = [
-            'experience', 'education', 'skills', 'python', 'java',
-            'javascript', 'developer', 'engineer', 'manager', 'analyst',
-            'project', 'team', 'company', 'university', 'bachelor',
-            'master', 'degree', 'certified', 'professional'
-        ]
-        text_lower = text.lower()
-        skill_matches = sum(1 for kw in skill_keywords if kw in text_lower)
-        
-        if skill_matches >= 8:
-            score += 3
-        elif skill_matches >= 5:
-            score += 2
-        elif skill_matches >= 2:
-            score += 1
-        
-        # Determine confidence level
-        if score >= 7:
+        if mean_confidence >= self.HIGH_CONFIDENCE:
             return "high"
-        elif score >= 4:
+        if mean_confidence >= self.MEDIUM_CONFIDENCE:
             return "medium"
-        else:
-            return "low"
+        return "low"
     
-    def get_pdf_page_count(self, pdf_path: str) -> int:
+    def get_pdf_page_count(self, pdf_source: DocumentSource) -> int:
         """
         Get the number of pages in a PDF
         
         Args:
-            pdf_path: Path to PDF file
+            pdf_source: Path to PDF file or its bytes
             
         Returns:
             Page count or 0 if error
         """
         try:
             from pypdf import PdfReader
-            reader = PdfReader(pdf_path)
+            reader = PdfReader(open_source(pdf_source))
             return len(reader.pages)
         except Exception:
             return 0
     
-    def should_skip_ocr(self, pdf_path: str) -> bool:
+    def should_skip_ocr(
+        self,
+        pdf_source: DocumentSource,
+        page_count: Optional[int] = None
+    ) -> bool:
         """
         Check if OCR should be skipped due to page count
         
         Args:
-            pdf_path: Path to PDF file
+            pdf_source: Path to PDF file or its bytes
+            page_count: Known page count (skips re-opening the PDF)
             
         Returns:
             True if OCR should be skipped
         """
-        page_count = self.get_pdf_page_count(pdf_path)
+        if page_count is None:
+            page_count = self.get_pdf_page_count(pdf_source)
         return page_count > self.MAX_OCR_PAGES
 
 
+def _build_preprocessor() -> Optional[NumpyPreprocessor]:
+    """NumPy preprocessing pipeline selected by OCR_PREPROCESS, if any"""
+    if config.OCR_PREPROCESS != "numpy":
+        return None
+    if not NUMPY_AVAILABLE:
+        print("OCR Warning: OCR_PREPROCESS=numpy but NumPy is not installed; using PIL")
+        return None
+    return NumpyPreprocessor(binarize=config.OCR_BINARIZE, deskew=bool(config.OCR_DESKEW))
+
+
+def _build_engine() -> Optional[TesserocrEngine]:
+    """In-process Tesseract engine selected by OCR_ENGINE, if any"""
+    if config.OCR_ENGINE != "tesserocr":
+        return None
+    if not TESSEROCR_AVAILABLE:
+        print("OCR Warning: OCR_ENGINE=tesserocr but tesserocr is not installed; using pytesseract")
+        return None
+    return TesserocrEngine(OCRService.TESSERACT_LANG, OCRService.TESSERACT_CONFIG)
+
+
 # Global instance for easy access
-ocr_service = OCRService()
+ocr_service = OCRService(
+    page_workers=config.OCR_PAGE_WORKERS,
+    max_memory_bytes=config.OCR_MAX_MEMORY_MB * 1024 * 1024 or None,
+    max_concurrent=config.OCR_MAX_CONCURRENT,
+    max_waiting=config.OCR_QUEUE_DEPTH,
+    wait_timeout=config.OCR_QUEUE_TIMEOUT_SECONDS,
+    degrade_when_busy=config.OCR_BUSY_MODE == "degrade",
+    page_cache_entries=config.OCR_PAGE_CACHE_ENTRIES,
+    preprocessor=_build_preprocessor(),
+    early_stop=bool(config.OCR_EARLY_STOP),
+    speculative=bool(config.OCR_SPECULATIVE),
+    engine=_build_engine()
+)
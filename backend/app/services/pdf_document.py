@@ -0,0 +1,279 @@
+"""
+PDF Document Service - Single-open parsed PDF shared across parsing stages
+"""
+import re
+import threading
+from contextlib import ExitStack
+from pypdf import PdfReader
+from pypdf.generic import ContentStream
+from typing import Dict, List, Optional, Tuple
+from app.services.document_source import DocumentSource, open_source, source_path
+
+
+# PDF transformation matrix [a b c d e f]
+Matrix = Tuple[float, float, float, float, float, float]
+IDENTITY: Matrix = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+def _multiply(m: Matrix, n: Matrix) -> Matrix:
+    """Matrix product m × n (apply m, then n)"""
+    a, b, c, d, e, f = m
+    A, B, C, D, E, F = n
+    return (
+        a * A + b * C, a * B + b * D,
+        c * A + d * C, c * B + d * D,
+        e * A + f * C + E, e * B + f * D + F,
+    )
+
+
+class PdfDocument:
+    """
+    Parsed PDF for a single request
+
+    Opens the file once and caches what the parsing stages need:
+    - Per-page text (each page is extracted at most once; scanned pages
+      are never extracted)
+    - Page count
+    - Image resource info and per-page image coverage
+    - Structural page kind: "text", "scanned" or "mixed", decided from
+      fonts, text-showing operators and image coverage without
+      extracting any text
+    - Page sizes, and a filesystem path for poppler, materialized on
+      first use and shared by every OCR run of the request
+
+    The text, table, image and OCR-decision checks all read from the
+    same instance instead of building their own PdfReader. Call close()
+    when done to release the materialized path.
+    """
+
+    # Structural page kinds
+    PAGE_TEXT = "text"
+    PAGE_SCANNED = "scanned"
+    PAGE_MIXED = "mixed"
+
+    # A page that shows text and has at least this fraction covered by
+    # images is "mixed" (e.g. a scan with a searchable text layer)
+    MIN_IMAGE_COVERAGE = 0.3
+
+    # Nesting limit when following form XObjects for image coverage
+    MAX_FORM_DEPTH = 3
+
+    # Text-showing operators (Tj, TJ, ', ") after a string or array operand
+    TEXT_SHOW_PATTERN = re.compile(rb'[)>\]]\s*(?:Tj|TJ|\'|")')
+
+    def __init__(self, source: DocumentSource):
+        self.source = source
+        self.reader = PdfReader(open_source(source))
+        self._page_texts: Optional[List[str]] = None
+        self._page_images: Optional[List[bool]] = None
+        self._page_coverage: Dict[int, float] = {}
+        self._page_kinds: Dict[int, str] = {}
+        self._path: Optional[str] = None
+        self._path_stack = ExitStack()
+        self._path_lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def page_count(self) -> int:
+        """Number of pages in the document"""
+        return len(self.reader.pages)
+
+    def page_size(self, page_index: int) -> Tuple[float, float]:
+        """(width, height) of a page in points"""
+        box = self.reader.pages[page_index].mediabox
+        return abs(float(box.width)), abs(float(box.height))
+
+    def path(self) -> str:
+        """
+        Filesystem path of the document, for tools that need one
+
+        Bytes sources are written once (memfd/tmpfs, see source_path) on
+        the first call and kept until close(). Safe to call from the OCR
+        page threads.
+
+        Raises:
+            ValueError: If the document was closed
+        """
+        with self._path_lock:
+            if self._closed:
+                raise ValueError("PDF document is closed")
+            if self._path is None:
+                self._path = self._path_stack.enter_context(source_path(self.source, suffix=".pdf"))
+            return self._path
+
+    def close(self) -> None:
+        """Release the materialized path, if any"""
+        with self._path_lock:
+            self._closed = True
+            self._path = None
+            self._path_stack.close()
+
+    @property
+    def page_texts(self) -> List[str]:
+        """
+        Text of each page, extracted once on first access
+
+        Pages without a text layer are returned as empty strings, without
+        running pypdf's text extraction on them.
+        """
+        if self._page_texts is None:
+            self._page_texts = [
+                "" if self.page_kind(index) == self.PAGE_SCANNED else page.extract_text() or ""
+                for index, page in enumerate(self.reader.pages)
+            ]
+        return self._page_texts
+
+    def page_kind(self, page_index: int) -> str:
+        """
+        Structural kind of a page, from its resources and content stream
+
+        - "scanned": no text is shown (no fonts, or no text-showing
+          operators), so only OCR can read it
+        - "mixed": shows text and is at least MIN_IMAGE_COVERAGE images
+        - "text": shows text, with little or no image area
+        """
+        if page_index not in self._page_kinds:
+            page = self.reader.pages[page_index]
+            try:
+                shows_text = self._shows_text(page.get_contents(), page.get('/Resources'), 0)
+            except Exception:
+                # Unparseable content: let text extraction decide
+                shows_text = True
+            if not shows_text:
+                kind = self.PAGE_SCANNED
+            elif self.image_coverage(page_index) >= self.MIN_IMAGE_COVERAGE:
+                kind = self.PAGE_MIXED
+            else:
+                kind = self.PAGE_TEXT
+            self._page_kinds[page_index] = kind
+        return self._page_kinds[page_index]
+
+    @property
+    def document_kind(self) -> str:
+        """PAGE_TEXT or PAGE_SCANNED when every page is that kind, else PAGE_MIXED"""
+        kinds = {self.page_kind(index) for index in range(self.page_count)}
+        if len(kinds) == 1 and self.PAGE_MIXED not in kinds:
+            return kinds.pop()
+        return self.PAGE_MIXED
+
+    @property
+    def page_images(self) -> List[bool]:
+        """Whether each page references at least one image XObject"""
+        if self._page_images is None:
+            self._page_images = [self._page_has_images(page) for page in self.reader.pages]
+        return self._page_images
+
+    @property
+    def has_images(self) -> bool:
+        """Whether any page references an image XObject"""
+        return any(self.page_images)
+
+    def image_coverage(self, page_index: int) -> float:
+        """
+        Fraction of a page's area covered by drawn images (0-1)
+
+        Computed from the content stream on first request, so only pages
+        that are actually examined pay for parsing it.
+        """
+        if page_index not in self._page_coverage:
+            coverage = 0.0
+            if self.page_images[page_index]:
+                try:
+                    coverage = self._page_image_coverage(self.reader.pages[page_index])
+                except Exception:
+                    # Unparseable content: assume the referenced image fills the page
+                    coverage = 1.0
+            self._page_coverage[page_index] = coverage
+        return self._page_coverage[page_index]
+
+    def _page_image_coverage(self, page) -> float:
+        box = page.mediabox
+        page_area = abs(float(box.width) * float(box.height))
+        if page_area <= 0:
+            return 0.0
+        image_area = self._image_area(page.get_contents(), page.get('/Resources'), IDENTITY, 0)
+        return min(1.0, image_area / page_area)
+
+    def _image_area(self, contents, resources, ctm: "Matrix", depth: int) -> float:
+        """
+        Total area of images drawn by a content stream, in page space
+
+        Tracks the current transformation matrix through q/Q/cm and adds
+        the transformed unit square of every image XObject and inline
+        image; form XObjects are followed a few levels deep.
+        """
+        if contents is None or depth > self.MAX_FORM_DEPTH:
+            return 0.0
+        xobjects = {}
+        if resources is not None:
+            resources = resources.get_object()
+            if '/XObject' in resources:
+                xobjects = resources['/XObject'].get_object()
+
+        area = 0.0
+        stack = []
+        for operands, operator in ContentStream(contents, self.reader).operations:
+            if operator == b"q":
+                stack.append(ctm)
+            elif operator == b"Q":
+                if stack:
+                    ctm = stack.pop()
+            elif operator == b"cm" and len(operands) == 6:
+                ctm = _multiply(tuple(float(v) for v in operands), ctm)
+            elif operator == b"INLINE IMAGE":
+                area += abs(ctm[0] * ctm[3] - ctm[1] * ctm[2])
+            elif operator == b"Do" and operands and operands[0] in xobjects:
+                xobject = xobjects[operands[0]].get_object()
+                subtype = xobject.get('/Subtype')
+                if subtype == '/Image':
+                    area += abs(ctm[0] * ctm[3] - ctm[1] * ctm[2])
+                elif subtype == '/Form':
+                    matrix = xobject.get('/Matrix')
+                    form_ctm = ctm
+                    if matrix is not None:
+                        form_ctm = _multiply(tuple(float(v) for v in matrix), ctm)
+                    area += self._image_area(
+                        xobject, xobject.get('/Resources', resources), form_ctm, depth + 1
+                    )
+        return area
+
+    def _shows_text(self, contents, resources, depth: int) -> bool:
+        """
+        Whether a content stream (or a form XObject it draws) shows text
+
+        Without a /Font resource nothing can be shown, so the stream is
+        only decoded and scanned for text operators when fonts exist.
+        """
+        if contents is None or depth > self.MAX_FORM_DEPTH:
+            return False
+        if resources is None:
+            return False
+        resources = resources.get_object()
+
+        if resources.get('/Font'):
+            if self.TEXT_SHOW_PATTERN.search(contents.get_data()):
+                return True
+
+        xobjects = resources.get('/XObject')
+        if xobjects:
+            xobjects = xobjects.get_object()
+            for name in xobjects:
+                xobject = xobjects[name].get_object()
+                if xobject.get('/Subtype') == '/Form':
+                    form_resources = xobject.get('/Resources', resources)
+                    if self._shows_text(xobject, form_resources, depth + 1):
+                        return True
+        return False
+
+    def _page_has_images(self, page) -> bool:
+        """Check a single page's resources for image XObjects"""
+        try:
+            if '/XObject' in page.get('/Resources', {}):
+                xobject = page['/Resources']['/XObject']
+                if xobject:
+                    for obj in xobject:
+                        if xobject[obj]['/Subtype'] == '/Image':
+                            return True
+        except Exception:
+            pass
+        return False
@@ -0,0 +1,148 @@
+"""
+Persistent Cache - SQLite-backed analysis cache shared by all workers on a node
+"""
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+
+class SQLiteAnalysisCache:
+    """
+    On-disk key/value store for serialized analysis results
+
+    Features:
+    - SQLite in WAL mode: many readers alongside one writer, safe across
+      uvicorn worker processes (each process/thread has its own connection)
+    - Survives restarts and deploys
+    - Size-based eviction of least recently used entries
+    - Payloads are zlib-compressed
+    """
+
+    DB_FILENAME = "analysis_cache.sqlite3"
+    BUSY_TIMEOUT_MS = 5000
+    EVICTION_BATCH = 32
+    # Access times are only rewritten when older than this, so hot
+    # entries don't turn every read into a write
+    TOUCH_INTERVAL_SECONDS = 60
+
+    def __init__(self, directory: str, max_bytes: int, ttl_seconds: int):
+        os.makedirs(directory, exist_ok=True)
+        self.db_path = os.path.join(directory, self.DB_FILENAME)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection (sqlite3 connections are not shareable)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=self.BUSY_TIMEOUT_MS / 1000,
+                isolation_level=None  # autocommit; transactions are explicit
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self) -> None:
+        conn = self._connect()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)"
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored JSON payload, or None on miss/expiry/error"""
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT payload, created_at, accessed_at FROM entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            payload, created_at, accessed_at = row
+            now = time.time()
+            if created_at + self.ttl_seconds < now:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            if now - accessed_at > self.TOUCH_INTERVAL_SECONDS:
+                conn.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+            return zlib.decompress(payload).decode("utf-8")
+        except (sqlite3.Error, zlib.error) as e:
+            print(f"Analysis cache read error: {str(e)}")
+            return None
+
+    def put(self, key: str, payload: str) -> None:
+        """Store a JSON payload and evict LRU entries beyond the size budget"""
+        blob = zlib.compress(payload.encode("utf-8"))
+        if len(blob) > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, payload, size, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, blob, len(blob), now, now)
+                )
+                self._evict(conn)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            print(f"Analysis cache write error: {str(e)}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop least recently used entries until within max_bytes"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        while total > self.max_bytes:
+            rows = conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT ?",
+                (self.EVICTION_BATCH,)
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        except sqlite3.Error:
+            entries, size = None, None
+        return {
+            "path": self.db_path,
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+        }
@@ -2,11 +2,14 @@
 Resume Parser Service - Extracts text and structured data from PDF/DOCX
 """
 import re
-from pypdf import PdfReader
 from docx import Document
 from typing import Dict, List, Any, Optional
 from app.models.schemas import CandidateInfo, Project, Experience, ExperienceSummary, Education
-from app.services.ocr_service import ocr_service
+from app.services.ocr_service import SpeculativeOCR, ocr_service
+from app.services.pdf_document import PdfDocument
+from app.services.docx_document import DocxDocument
+from app.services.document_source import DocumentSource, open_source
+from app.services.resume_sections import SECTION_HEADERS, section_heading
 
 
 class ResumeParser:
@@ -25,14 +28,7 @@ class ResumeParser:
     URL_PATTERN = r'https?://[^\s<>"{}|\\^`\[\]]+'
     
     # Section headers
-    SECTION_HEADERS = {
-        'experience': ['experience', 'work experience', 'employment', 'work history', 'professional experience', 'career history'],
-        'education': ['education', 'academic', 'qualification', 'academics', 'educational background'],
-        'skills': ['skills', 'technical skills', 'competencies', 'technologies', 'tech stack', 'expertise'],
-        'projects': ['projects', 'personal projects', 'academic projects', 'key projects', 'portfolio'],
-        'certifications': ['certifications', 'certificates', 'credentials', 'licenses'],
-        'summary': ['summary', 'profile', 'objective', 'about', 'professional summary', 'career objective']
-    }
+    SECTION_HEADERS = SECTION_HEADERS
     
     # Action verbs for experience analysis
     ACTION_VERBS = [
@@ -46,33 +42,89 @@ class ResumeParser:
         'spearheaded', 'streamlined', 'supervised', 'transformed', 'upgraded'
     ]
     
-    def parse(self, file_path: str, file_ext: str) -> Dict[str, Any]:
-        """Main parsing method with OCR fallback for scanned PDFs"""
+    def parse(self, source: DocumentSource, file_ext: str) -> Dict[str, Any]:
+        """
+        Main parsing method with OCR fallback for scanned PDFs
+        
+        Args:
+            source: File path, or the document's bytes (bytes/BytesIO/memoryview)
+                    so uploads can be parsed without touching disk
+            file_ext: ".pdf" or ".docx"
+        """
+        return self.parse_structure(self.extract_text(source, file_ext))
+    
+    def extract_text(self, source: DocumentSource, file_ext: str) -> Dict[str, Any]:
+        """
+        First parsing stage: raw text, formatting flags and OCR metadata
+        
+        Args:
+            source: File path or the document's bytes
+            file_ext: ".pdf" or ".docx"
+        """
         # Initialize parsing metadata
         parsing_method = self.PARSING_STANDARD
         ocr_confidence = None
+        ocr_details = {}
         
         # Extract raw text
         if file_ext == '.pdf':
-            raw_text = self._extract_pdf_text(file_path)
-            has_tables = self._check_pdf_tables(file_path)
-            has_images = self._check_pdf_images(file_path)
+            # Open the PDF once and share it across all PDF stages
+            pdf = self._open_pdf(source)
             
-            # Check if we need OCR fallback (only for PDFs)
-            raw_text, parsing_method, ocr_confidence = self._apply_ocr_if_needed(
-                file_path, raw_text
-            )
+            # Likely scan: OCR page 1 while the text layer is being read
+            speculative = self._start_speculative_ocr(source, pdf)
+            try:
+                raw_text = self._extract_pdf_text(pdf)
+                has_tables = self._check_pdf_tables(pdf)
+                has_images = self._check_pdf_images(pdf)
+                
+                # Check if we need OCR fallback (only for PDFs)
+                raw_text, parsing_method, ocr_confidence, ocr_details = self._apply_ocr_if_needed(
+                    source, raw_text, pdf, speculative
+                )
+            finally:
+                if speculative is None:
+                    pdf.close()
+                else:
+                    # No-op if OCR used it; otherwise the text layer was enough
+                    speculative.cancel()
+                    # Its page may still be winding down on the document's path
+                    speculative.add_done_callback(pdf.close)
         else:
             # DOCX files are always text-based, never OCR
-            raw_text = self._extract_docx_text(file_path)
-            has_tables = self._check_docx_tables(file_path)
-            has_images = self._check_docx_images(file_path)
+            raw_text, has_tables, has_images = self._extract_docx(source)
+        
+        return {
+            "raw_text": raw_text,
+            "formatting": {
+                "has_tables": has_tables,
+                "has_images": has_images,
+                "word_count": len(raw_text.split()),
+                "line_count": len(raw_text.split('\n'))
+            },
+            "parsing_method": parsing_method,
+            "ocr_confidence": ocr_confidence,
+            "ocr_tier": ocr_details.get("ocr_tier"),
+            "ocr_mean_confidence": ocr_details.get("ocr_mean_confidence"),
+            "ocr_page_confidences": ocr_details.get("ocr_page_confidences"),
+            "contact_text": ocr_details.get("contact_text")
+        }
+    
+    def parse_structure(self, extracted: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Second parsing stage: sections, candidate info, experience,
+        projects and education from the output of extract_text()
+        """
+        raw_text = extracted["raw_text"]
         
         # Parse sections
         sections = self._identify_sections(raw_text)
         
         # Extract structured data
         candidate = self._extract_candidate_info(raw_text)
+        if extracted.get("contact_text"):
+            # Contact details recovered by header-band OCR
+            candidate = self._merge_contact_info(candidate, extracted["contact_text"])
         experience = self._extract_experience(raw_text, sections.get('experience', ''))
         projects = self._extract_projects(raw_text, sections.get('projects', ''))
         education = self._extract_education(raw_text, sections.get('education', ''))
@@ -84,20 +136,20 @@ class ResumeParser:
             "projects": projects,
             "education": education,
             "sections": sections,
-            "formatting": {
-                "has_tables": has_tables,
-                "has_images": has_images,
-                "word_count": len(raw_text.split()),
-                "line_count": len(raw_text.split('\n'))
-            },
-            "parsing_method": parsing_method,
-            "ocr_confidence": ocr_confidence
+            "formatting": extracted["formatting"],
+            "parsing_method": extracted["parsing_method"],
+            "ocr_confidence": extracted["ocr_confidence"],
+            "ocr_tier": extracted["ocr_tier"],
+            "ocr_mean_confidence": extracted["ocr_mean_confidence"],
+            "ocr_page_confidences": extracted["ocr_page_confidences"]
         }
     
     def _apply_ocr_if_needed(
         self, 
-        file_path: str, 
-        standard_text: str
+        source: DocumentSource, 
+        standard_text: str,
+        pdf: Optional[PdfDocument] = None,
+        speculative: Optional[SpeculativeOCR] = None
     ) -> tuple:
         """
         Apply OCR fallback if standard extraction is insufficient
@@ -108,18 +160,29 @@ class ResumeParser:
         - No email found → OCR
         - No phone found → OCR
         
-        Never merges OCR + standard text.
+        When the text is otherwise good and only the email or phone is
+        missing, just the header band of page 1 is OCR'd; the standard text
+        is kept and the band's text is returned as ocr_details["contact_text"]
+        for parse_structure() to fill in the contact details.
+        
+        When only some pages lack a usable text layer (e.g. a scanned
+        certificate page), just those pages are OCR'd and stitched with the
+        standard text of the others, in page order. Otherwise the whole
+        document is OCR'd and replaces the standard text.
         
         Args:
-            file_path: Path to PDF file
+            source: PDF path or bytes
             standard_text: Text extracted via pypdf
+            pdf: Already-opened document (page count, page sizes and the
+                path handed to OCR are reused instead of re-parsing the PDF)
+            speculative: Page 1 OCR already under way, reused if OCR runs
             
         Returns:
-            Tuple of (text, parsing_method, ocr_confidence)
+            Tuple of (text, parsing_method, ocr_confidence, ocr_details)
         """
         # Check if OCR service is available
         if not ocr_service.is_available():
-            return standard_text, self.PARSING_STANDARD, None
+            return standard_text, self.PARSING_STANDARD, None, {}
         
         # Quick check for email and phone in standard text
         email_match = re.search(self.EMAIL_PATTERN, standard_text)
@@ -132,63 +195,131 @@ class ResumeParser:
             phone=phone_match.group() if phone_match else None
         ):
             # Standard extraction is good enough
-            return standard_text, self.PARSING_STANDARD, None
+            return standard_text, self.PARSING_STANDARD, None, {}
+        
+        # A good text layer that only lacks an email or phone: OCR just the
+        # header band of page 1 and keep the standard text. A short text
+        # layer still gets the OCR below, even when every page is
+        # structurally text (e.g. a body outlined into vector paths).
+        ocr_pages = ocr_service.pages_needing_ocr(pdf) if pdf is not None else []
+        if pdf is not None and not ocr_pages and ocr_service.needs_contact_ocr(
+            standard_text,
+            email=email_match.group() if email_match else None,
+            phone=phone_match.group() if phone_match else None
+        ):
+            if speculative is not None:
+                # Not needed, and its OCR slot is needed by the band below
+                speculative.cancel()
+            contact_text = ocr_service.extract_contact_with_ocr(source, pdf=pdf)
+            details = {"contact_text": contact_text} if contact_text else {}
+            return standard_text, self.PARSING_STANDARD, None, details
         
         # Check if PDF is too large for OCR
-        if ocr_service.should_skip_ocr(file_path):
+        page_count = pdf.page_count if pdf is not None else None
+        if ocr_service.should_skip_ocr(source, page_count=page_count):
             # PDF has too many pages, skip OCR
-            return standard_text, self.PARSING_OCR_UNAVAILABLE, None
+            return standard_text, self.PARSING_OCR_UNAVAILABLE, None, {}
         
-        # Attempt OCR extraction
-        ocr_text, parsing_method, confidence = ocr_service.extract_text_with_ocr(
-            file_path
-        )
+        # OCR only the scanned pages of a mixed document
+        if ocr_pages and len(ocr_pages) < pdf.page_count:
+            ocr_text, parsing_method, confidence, details = ocr_service.extract_pages_with_ocr(
+                source, pdf.page_texts, ocr_pages, speculative=speculative, pdf=pdf
+            )
+        else:
+            # Attempt OCR extraction of the whole document
+            ocr_text, parsing_method, confidence, details = ocr_service.extract_text_with_ocr(
+                source, page_count=page_count, speculative=speculative, pdf=pdf
+            )
         
         if ocr_text and parsing_method == self.PARSING_OCR:
             # OCR succeeded - replace standard text entirely
-            return ocr_text, parsing_method, confidence
+            return ocr_text, parsing_method, confidence, details
         else:
             # OCR failed or unavailable - fall back to standard
-            return standard_text, parsing_method, confidence
+            return standard_text, parsing_method, confidence, {}
+    
+    def _start_speculative_ocr(
+        self,
+        source: DocumentSource,
+        pdf: PdfDocument
+    ) -> Optional[SpeculativeOCR]:
+        """
+        Start OCR of page 1 early when it is a scanned page
+        
+        Mixed pages (text over a photo or background image) are left
+        alone: their text layer is usually enough, and speculating on them
+        would tie up OCR slots real scans need.
+        """
+        if not ocr_service.is_available():
+            return None
+        try:
+            if pdf.page_count > ocr_service.MAX_OCR_PAGES:
+                return None
+            if pdf.page_kind(0) != PdfDocument.PAGE_SCANNED:
+                return None
+        except Exception:
+            return None
+        return ocr_service.start_speculative_ocr(source, pdf=pdf)
+    
+    def _open_pdf(self, source: DocumentSource) -> PdfDocument:
+        """Open a PDF once for all parsing stages"""
+        try:
+            return PdfDocument(source)
+        except Exception as e:
+            raise Exception(f"Error parsing PDF: {str(e)}")
     
-    def _extract_pdf_text(self, file_path: str) -> str:
+    def _extract_pdf_text(self, pdf: PdfDocument) -> str:
         """Extract text from PDF using pypdf"""
-        text = ""
         try:
-            reader = PdfReader(file_path)
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
+            page_texts = pdf.page_texts
         except Exception as e:
             raise Exception(f"Error parsing PDF: {str(e)}")
-        return text
+        return "".join(page_text + "\n" for page_text in page_texts if page_text)
     
-    def _extract_docx_text(self, file_path: str) -> str:
+    def _extract_docx(self, source: DocumentSource) -> tuple:
+        """
+        Extract text, table and image info from DOCX in a single pass
+        
+        Uses the streaming DocxDocument reader; falls back to python-docx
+        for packages it cannot read so errors stay unchanged.
+        
+        Returns:
+            Tuple of (text, has_tables, has_images)
+        """
+        try:
+            docx = DocxDocument(source)
+            return docx.text, docx.has_tables, docx.has_images
+        except Exception:
+            pass
+        
+        raw_text = self._extract_docx_text(source)
+        has_tables = self._check_docx_tables(source)
+        has_images = self._check_docx_images(source)
+        return raw_text, has_tables, has_images
+    
+    def _extract_docx_text(self, source: DocumentSource) -> str:
         """Extract text from DOCX"""
-        text = ""
+        parts = []
         try:
-            doc = Document(file_path)
+            doc = Document(open_source(source))
             for para in doc.paragraphs:
-                text += para.text + "\n"
+                parts.append(para.text + "\n")
             # Also extract from tables
             for table in doc.tables:
                 for row in table.rows:
                     for cell in row.cells:
-                        text += cell.text + " "
-                    text += "\n"
+                        parts.append(cell.text + " ")
+                    parts.append("\n")
         except Exception as e:
             raise Exception(f"Error parsing DOCX: {str(e)}")
-        return text
+        return "".join(parts)
     
-    def _check_pdf_tables(self, file_path: str) -> bool:
+    def _check_pdf_tables(self, pdf: PdfDocument) -> bool:
         """Check if PDF contains tables (potential ATS issue)"""
         # pypdf doesn't have built-in table detection
         # We'll use a heuristic: check for table-like patterns in text
         try:
-            reader = PdfReader(file_path)
-            for page in reader.pages:
-                text = page.extract_text() or ""
+            for text in pdf.page_texts:
                 # Look for table-like patterns (multiple tabs or consistent spacing)
                 lines = text.split('\n')
                 table_like_lines = 0
@@ -201,33 +332,25 @@ class ResumeParser:
             pass
         return False
     
-    def _check_pdf_images(self, file_path: str) -> bool:
+    def _check_pdf_images(self, pdf: PdfDocument) -> bool:
         """Check if PDF contains images"""
         try:
-            reader = PdfReader(file_path)
-            for page in reader.pages:
-                if '/XObject' in page.get('/Resources', {}):
-                    xobject = page['/Resources']['/XObject']
-                    if xobject:
-                        for obj in xobject:
-                            if xobject[obj]['/Subtype'] == '/Image':
-                                return True
+            return pdf.has_images
         except:
-            pass
-        return False
+            return False
     
-    def _check_docx_tables(self, file_path: str) -> bool:
+    def _check_docx_tables(self, source: DocumentSource) -> bool:
         """Check if DOCX contains tables"""
         try:
-            doc = Document(file_path)
+            doc = Document(open_source(source))
             return len(doc.tables) > 0
         except:
             return False
     
-    def _check_docx_images(self, file_path: str) -> bool:
+    def _check_docx_images(self, source: DocumentSource) -> bool:
         """Check if DOCX contains images"""
         try:
-            doc = Document(file_path)
+            doc = Document(open_source(source))
             for rel in doc.part.rels.values():
                 if "image" in rel.reltype:
                     return True
@@ -243,16 +366,7 @@ class ResumeParser:
         current_content = []
         
         for line in lines:
-            line_lower = line.lower().strip()
-            section_found = None
-            
-            for section_type, headers in self.SECTION_HEADERS.items():
-                for header in headers:
-                    if line_lower == header or line_lower.startswith(header + ':') or line_lower.startswith(header + ' '):
-                        section_found = section_type
-                        break
-                if section_found:
-                    break
+            section_found = section_heading(line, self.SECTION_HEADERS)
             
             if section_found:
                 if current_section:
@@ -316,6 +430,19 @@ class ResumeParser:
             github=github
         )
     
+    def _merge_contact_info(self, candidate: CandidateInfo, contact_text: str) -> CandidateInfo:
+        """Fill a missing email/phone from OCR'd header text"""
+        updates = {}
+        if not candidate.email:
+            email_match = re.search(self.EMAIL_PATTERN, contact_text)
+            if email_match:
+                updates["email"] = email_match.group()
+        if not candidate.phone:
+            phone_match = re.search(self.PHONE_PATTERN, contact_text)
+            if phone_match:
+                updates["phone"] = phone_match.group()
+        return candidate.model_copy(update=updates) if updates else candidate
+    
     def _extract_location(self, text: str) -> Optional[str]:
         """Extract location from resume"""
         # Common location patterns
@@ -0,0 +1,24 @@
+"""
+Resume Sections - Section headings shared by the parser and OCR early stop
+"""
+from typing import Dict, List, Optional
+
+# Section headers
+SECTION_HEADERS: Dict[str, List[str]] = {
+    'experience': ['experience', 'work experience', 'employment', 'work history', 'professional experience', 'career history'],
+    'education': ['education', 'academic', 'qualification', 'academics', 'educational background'],
+    'skills': ['skills', 'technical skills', 'competencies', 'technologies', 'tech stack', 'expertise'],
+    'projects': ['projects', 'personal projects', 'academic projects', 'key projects', 'portfolio'],
+    'certifications': ['certifications', 'certificates', 'credentials', 'licenses'],
+    'summary': ['summary', 'profile', 'objective', 'about', 'professional summary', 'career objective']
+}
+
+
+def section_heading(line: str, headers: Dict[str, List[str]] = SECTION_HEADERS) -> Optional[str]:
+    """Section type a line opens ("experience", "skills", ...), or None for body text"""
+    line_lower = line.lower().strip()
+    for section_type, section_headers in headers.items():
+        for header in section_headers:
+            if line_lower == header or line_lower.startswith(header + ':') or line_lower.startswith(header + ' '):
+                return section_type
+    return None
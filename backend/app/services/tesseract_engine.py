@@ -0,0 +1,147 @@
+"""
+Tesseract Engine - Warm in-process Tesseract through the tesserocr C API bindings
+"""
+import re
+import threading
+from contextlib import contextmanager
+from importlib.util import find_spec
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    from PIL import Image
+except ImportError:
+    pass
+
+# tesserocr is optional - without it OCRService runs a tesseract process per
+# page through pytesseract. It is only imported once an engine is first
+# needed, after OCRService has set OMP_THREAD_LIMIT for the Tesseract library.
+TESSEROCR_AVAILABLE = find_spec("tesserocr") is not None
+
+
+class TesseractEngineError(Exception):
+    """Raised when the Tesseract library cannot be loaded or initialized"""
+    pass
+
+
+class TesserocrEngine:
+    """
+    Tesseract kept loaded in the worker process, fed page images from memory
+
+    Features:
+    - Language data is loaded once per engine instead of once per page
+    - Grayscale pages are passed as raw pixel buffers: no temp image file
+      and no tesseract process per page
+    - One engine per concurrently OCR'd page, reused across runs (an
+      engine is not thread-safe; idle ones are kept for the next page)
+    - Returns the same word table as pytesseract.image_to_data, so text
+      rebuilding and confidence scoring are shared with that backend
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, lang: str, config: str):
+        """
+        Args:
+            lang: Tesseract language(s), e.g. "eng"
+            config: Tesseract command-line options; --oem and --psm are
+                applied, anything else is ignored
+        """
+        self.lang = lang
+        self.oem = self._option(config, "oem")
+        self.psm = self._option(config, "psm")
+        self._idle: List[Any] = []
+        self._lock = threading.Lock()
+
+    def _option(self, config: str, name: str) -> Optional[int]:
+        match = re.search(rf'--{name}\s+(\d+)', config)
+        return int(match.group(1)) if match else None
+
+    def image_to_data(self, image: 'Image.Image', timeout: float) -> Optional[Dict[str, List[Any]]]:
+        """
+        Recognize a page image
+
+        Args:
+            image: PIL Image (grayscale is passed without conversion)
+            timeout: Seconds recognition may take
+
+        Returns:
+            Word table with pytesseract's "text", "conf", "block_num",
+            "par_num" and "line_num" columns, or None if recognition did
+            not finish within `timeout`
+
+        Raises:
+            TesseractEngineError: If Tesseract could not be initialized
+        """
+        with self._engine() as api:
+            if image.mode == 'L':
+                width, height = image.size
+                api.SetImageBytes(image.tobytes(), width, height, 1, width)
+            else:
+                api.SetImage(image)
+            try:
+                if not api.Recognize(timeout=max(1, int(timeout * 1000))):
+                    return None
+                return self._word_table(api)
+            finally:
+                # Drops the image and results, keeps the language data
+                api.Clear()
+
+    def _word_table(self, api: Any) -> Dict[str, List[Any]]:
+        from tesserocr import RIL
+
+        data = {"text": [], "conf": [], "block_num": [], "par_num": [], "line_num": []}
+        iterator = api.GetIterator()
+        if iterator is None:
+            return data
+
+        block = paragraph = line = 0
+        while True:
+            if iterator.IsAtBeginningOf(RIL.BLOCK):
+                block, paragraph, line = block + 1, 0, 0
+            if iterator.IsAtBeginningOf(RIL.PARA):
+                paragraph, line = paragraph + 1, 0
+            if iterator.IsAtBeginningOf(RIL.TEXTLINE):
+                line += 1
+            word = iterator.GetUTF8Text(RIL.WORD)
+            if word:
+                data["text"].append(word)
+                data["conf"].append(iterator.Confidence(RIL.WORD))
+                data["block_num"].append(block)
+                data["par_num"].append(paragraph)
+                data["line_num"].append(line)
+            if not iterator.Next(RIL.WORD):
+                return data
+
+    @contextmanager
+    def _engine(self) -> Iterator[Any]:
+        with self._lock:
+            api = self._idle.pop() if self._idle else None
+        if api is None:
+            api = self._create()
+        try:
+            yield api
+        finally:
+            with self._lock:
+                self._idle.append(api)
+
+    def _create(self) -> Any:
+        # OEM/PSM are plain int constants in tesserocr, passed through as-is.
+        # Any failure here (missing library or language data, bad options)
+        # makes OCRService fall back to pytesseract.
+        try:
+            from tesserocr import PyTessBaseAPI
+            options = {}
+            if self.oem is not None:
+                options["oem"] = self.oem
+            if self.psm is not None:
+                options["psm"] = self.psm
+            return PyTessBaseAPI(lang=self.lang, **options)
+        except Exception as e:
+            raise TesseractEngineError(str(e))
+
+    def close(self) -> None:
+        """Unload every idle engine"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for api in idle:
+            api.End()
@@ -0,0 +1,147 @@
+"""
+Upload Ingest Service - Chunked upload reading with early size/type rejection
+"""
+from typing import Callable, Optional, Tuple
+
+from starlette.exceptions import HTTPException
+
+
+class UploadRejected(Exception):
+    """Raised when an upload fails size or type validation"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class UploadIngest:
+    """
+    Read uploads in chunks and reject bad ones as early as possible
+
+    - The declared size (when known) is checked before reading anything
+    - The size limit is enforced while reading, so at most one chunk past
+      the limit is ever copied into memory
+    - The file signature is sniffed from the first bytes, so a file that
+      only claims to be a PDF/DOCX is rejected before the rest is copied
+
+    The multipart body has already been received (and spooled by
+    Starlette) by then; UploadSizeLimit caps how much of it is received.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    # Bytes inspected for the file signature. PDF readers accept a header
+    # anywhere in the first 1KB, so the PDF marker is searched, not matched.
+    SNIFF_SIZE = 1024
+    PDF_SIGNATURE = b"%PDF-"
+    ZIP_SIGNATURE = b"PK\x03\x04"
+
+    def __init__(self, max_size: int, chunk_size: Optional[int] = None):
+        self.max_size = max_size
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+
+    @property
+    def size_error(self) -> str:
+        return f"File size exceeds {self.max_size // (1024 * 1024)}MB limit"
+
+    def check_declared_size(self, size: Optional[int]) -> None:
+        """Reject up front when the client-declared size is already too large"""
+        if size is not None and size > self.max_size:
+            raise UploadRejected(400, self.size_error)
+
+    def matches_signature(self, head: bytes, file_ext: str) -> bool:
+        """Check the leading bytes against the expected file type"""
+        if file_ext == ".pdf":
+            return self.PDF_SIGNATURE in head[:self.SNIFF_SIZE]
+        if file_ext == ".docx":
+            return head.startswith(self.ZIP_SIGNATURE)
+        return False
+
+    async def read(self, file, file_ext: str) -> bytes:
+        """
+        Read an upload into memory, validating as it streams
+
+        Args:
+            file: UploadFile (anything with an async read(size) method)
+            file_ext: Expected extension (".pdf" or ".docx")
+
+        Returns:
+            The complete file content
+
+        Raises:
+            UploadRejected: If the file is too large or not the claimed type
+        """
+        self.check_declared_size(getattr(file, "size", None))
+
+        buffer = bytearray()
+        sniffed = False
+        while True:
+            chunk = await file.read(self.chunk_size)
+            if not chunk:
+                break
+            buffer += chunk
+
+            if len(buffer) > self.max_size:
+                raise UploadRejected(400, self.size_error)
+
+            if not sniffed and len(buffer) >= self.SNIFF_SIZE:
+                self._check_signature(buffer, file_ext)
+                sniffed = True
+
+        if not sniffed:
+            # Whole file was smaller than the sniff window
+            self._check_signature(buffer, file_ext)
+
+        return bytes(buffer)
+
+    def _check_signature(self, head: bytes, file_ext: str) -> None:
+        if not self.matches_signature(bytes(head[:self.SNIFF_SIZE]), file_ext):
+            raise UploadRejected(
+                400,
+                f"File content does not match the {file_ext} file type"
+            )
+
+
+class UploadSizeLimit:
+    """
+    ASGI middleware that stops receiving a request body past a size limit
+
+    Body bytes are counted as they arrive, before any multipart parsing,
+    so a client that sends more than the limit - with a false
+    Content-Length or none at all (Transfer-Encoding: chunked) - is
+    refused with a 400 once the limit is passed instead of having its
+    whole body spooled.
+    """
+
+    def __init__(self, app, limit: Callable[[str, str], Optional[Tuple[int, str]]]):
+        """
+        Args:
+            app: ASGI application to wrap
+            limit: Called with the request method and path; returns
+                (max body bytes, error detail), or None for no limit
+        """
+        self.app = app
+        self.limit = limit
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limit(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        max_size, detail = limit
+        received = 0
+
+        async def receive_limited():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_size:
+                    # Raised into the body parsing of the endpoint, so it
+                    # becomes an ordinary 400 response
+                    raise HTTPException(status_code=400, detail=detail)
+            return message
+
+        await self.app(scope, receive_limited, send)
@@ -0,0 +1,262 @@
+"""
+Worker Pool - Runs the CPU-bound analysis pipeline in a managed process pool
+"""
+import asyncio
+import multiprocessing
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from app.models.schemas import AnalysisResponse
+from app.services.analysis_pipeline import STAGE_COMPLETE, AnalysisPipeline
+from app.services.cpu_limits import available_cpus
+from app.services.ocr_service import ocr_service
+
+
+class PoolBusyError(Exception):
+    """Raised when the pool's queue is full and the caller asked not to wait"""
+    pass
+
+
+# Per-process pipeline, built once by the pool initializer
+_worker_pipeline: Optional[AnalysisPipeline] = None
+
+
+def init_worker(
+    pipeline: Optional[AnalysisPipeline] = None,
+    ocr_state: Optional[Tuple[Any, ...]] = None
+) -> None:
+    """
+    Preload services in each worker so requests don't pay for setup
+
+    Args:
+        pipeline: Pipeline to use (default: a new one)
+        ocr_state: Shared OCR metrics and admission limit of the server
+            process (OCRService.shared_state())
+    """
+    global _worker_pipeline
+    _worker_pipeline = pipeline or AnalysisPipeline()
+    if ocr_state is not None:
+        ocr_service.attach_shared_state(ocr_state)
+
+
+def worker_pipeline() -> AnalysisPipeline:
+    """This process's pipeline, for functions run through the pool"""
+    if _worker_pipeline is None:
+        init_worker()
+    return _worker_pipeline
+
+
+def analyze_in_worker(content: bytes, file_ext: str) -> AnalysisResponse:
+    return worker_pipeline().analyze(content, file_ext)
+
+
+def stream_in_worker(stages: Any, content: bytes, file_ext: str) -> None:
+    """Run the pipeline, putting each (stage, payload) on `stages` as it finishes"""
+    for stage, payload in worker_pipeline().iter_stages(content, file_ext):
+        stages.put((stage, payload))
+
+
+class AnalysisWorkerPool:
+    """
+    Process pool for parse → extract → classify → score
+
+    Features:
+    - Size defaults to the cgroup-aware CPU count
+    - Workers preload the pipeline services once
+    - Bounded admission: at most `workers + max_queue` analyses are in
+      flight; beyond that callers either fail fast or wait
+    - A crashed worker (e.g. OOM-killed) replaces the pool instead of
+      breaking every later request
+    - With 0 workers the pipeline runs in a thread, still off the event loop
+    - Streamed analyses also run in a worker, with stage results sent
+      back over a manager queue as they finish
+    """
+    
+    # How often a streamed analysis checks whether its worker is still alive
+    STREAM_POLL_SECONDS = 0.5
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_queue: int = 16,
+        pipeline: Optional[AnalysisPipeline] = None
+    ):
+        self.workers = available_cpus() if workers is None else workers
+        self.max_queue = max_queue
+        self.capacity = max(1, self.workers) + max_queue
+        self._pipeline = pipeline
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager: Optional[Any] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.restarts = 0
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.capacity)
+        return self._slots
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+                initargs=(None, ocr_service.shared_state())
+            )
+        return self._executor
+
+    async def analyze(
+        self,
+        content: bytes,
+        file_ext: str,
+        wait: bool = False
+    ) -> AnalysisResponse:
+        """
+        Run the pipeline for one upload
+
+        Args:
+            content: Uploaded file bytes
+            file_ext: ".pdf" or ".docx"
+            wait: Wait for a free slot instead of raising PoolBusyError
+
+        Raises:
+            PoolBusyError: If the queue is full and `wait` is False
+        """
+        return await self.run(analyze_in_worker, content, file_ext, wait=wait)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, wait: bool = False) -> Any:
+        """
+        Run a module-level function (which may use worker_pipeline()) in
+        the pool, under the same admission control as analyze()
+
+        Raises:
+            PoolBusyError: If the queue is full and `wait` is False
+        """
+        async with self.reserve(wait=wait):
+            result = await self._run(fn, *args)
+        return result
+
+    async def iter_stages(
+        self,
+        content: bytes,
+        file_ext: str,
+        wait: bool = False
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Run the pipeline for one upload in the pool, yielding each
+        (stage, payload) as soon as the worker finishes it
+        
+        Raises:
+            PoolBusyError: If the queue is full and `wait` is False
+        """
+        async with self.reserve(wait=wait):
+            if self.workers <= 0:
+                if _worker_pipeline is None:
+                    init_worker(self._pipeline)
+                async for item in iterate_in_threadpool(worker_pipeline().iter_stages(content, file_ext)):
+                    yield item
+                return
+            
+            stages = await run_in_threadpool(self._get_manager().Queue)
+            task = asyncio.ensure_future(self._run(stream_in_worker, stages, content, file_ext))
+            try:
+                while True:
+                    # Checked first: once the worker has returned, all of
+                    # its stages are already on the queue
+                    finished = task.done()
+                    try:
+                        stage, payload = await run_in_threadpool(
+                            stages.get, True, self.STREAM_POLL_SECONDS
+                        )
+                    except queue.Empty:
+                        if finished:
+                            # Raises the worker's error (or a crash)
+                            task.result()
+                            raise Exception("Analysis worker stopped without a result")
+                        continue
+                    yield stage, payload
+                    if stage == STAGE_COMPLETE:
+                        break
+                await task
+            finally:
+                # Keep the slot until the worker is done, even if the
+                # client went away mid-stream
+                if not task.done():
+                    await asyncio.wait({task})
+                if not task.cancelled():
+                    task.exception()
+    
+    def _get_manager(self) -> Any:
+        if self._manager is None:
+            self._manager = multiprocessing.get_context("spawn").Manager()
+        return self._manager
+    
+    @asynccontextmanager
+    async def reserve(self, wait: bool = False) -> AsyncIterator[None]:
+        """
+        Hold one admission slot, for work run outside the pool itself
+        that should count against its capacity
+
+        Raises:
+            PoolBusyError: If the queue is full and `wait` is False
+        """
+        if not wait and self.slots.locked():
+            self.rejected += 1
+            raise PoolBusyError("Analysis queue is full")
+
+        async with self.slots:
+            self._in_flight += 1
+            try:
+                yield
+            finally:
+                self._in_flight -= 1
+        self.completed += 1
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.workers <= 0:
+            if _worker_pipeline is None:
+                init_worker(self._pipeline)
+            return await run_in_threadpool(fn, *args)
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            return await loop.run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            # A worker died mid-task; replace the pool for later requests
+            if self._executor is executor:
+                self._executor = None
+                self.restarts += 1
+                executor.shutdown(wait=False, cancel_futures=True)
+                # Free the OCR slots the dead worker was holding
+                ocr_service.admission.reclaim()
+            raise Exception("Analysis worker crashed while processing this file")
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "mode": "process" if self.workers > 0 else "thread",
+            "capacity": self.capacity,
+            "in_flight": self._in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "restarts": self.restarts,
+        }
@@ -0,0 +1,89 @@
+"""
+OCR engine benchmark - tesseract process per page (pytesseract) vs a warm
+in-process engine (tesserocr)
+
+Recognizes the same preprocessed page images with each backend and reports
+the first-page latency (process start or engine load), the per-page latency
+of later pages, and throughput with several pages recognized at once.
+
+Usage (from backend/):
+    python -m benchmarks.ocr_engines
+    python -m benchmarks.ocr_engines --pdf resumes/scan.pdf --runs 5 --threads 4
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from PIL import Image
+
+from benchmarks.ocr_preprocess import TESSERACT_AVAILABLE, pdf_pages, synthetic_page
+from app.services.ocr_service import OCRService
+from app.services.tesseract_engine import TESSEROCR_AVAILABLE, TesserocrEngine
+
+
+def backends() -> Dict[str, OCRService]:
+    services = {"pytesseract": OCRService(page_cache_entries=0)}
+    if TESSEROCR_AVAILABLE:
+        services["tesserocr"] = OCRService(
+            page_cache_entries=0,
+            engine=TesserocrEngine(OCRService.TESSERACT_LANG, OCRService.TESSERACT_CONFIG)
+        )
+    return services
+
+
+def recognize(service: OCRService, image: Image.Image) -> float:
+    """Milliseconds to recognize one page"""
+    start = time.perf_counter()
+    service._recognize(image, time.monotonic() + 120, threading.Event())
+    return (time.perf_counter() - start) * 1000
+
+
+def run(images: List[Image.Image], runs: int, threads: int) -> None:
+    print(f"{'backend':<14}{'first page ms':>15}{'median ms':>11}{'p95 ms':>9}{'pages/s':>9}")
+    for name, service in backends().items():
+        first = recognize(service, images[0])
+        latencies = [recognize(service, image) for _ in range(runs) for image in images]
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+        batch = images * runs
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            start = time.perf_counter()
+            list(executor.map(lambda image: recognize(service, image), batch))
+            throughput = len(batch) / (time.perf_counter() - start)
+
+        print(f"{name:<14}{first:>15.1f}{statistics.median(latencies):>11.1f}{p95:>9.1f}{throughput:>9.2f}")
+
+    if not TESSEROCR_AVAILABLE:
+        print("tesserocr is not installed: only pytesseract was measured")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pdf", nargs="*", default=[], help="Scanned PDFs to benchmark on")
+    parser.add_argument("--dpi", type=int, default=200, help="Render resolution")
+    parser.add_argument("--runs", type=int, default=3, help="Passes over the pages")
+    parser.add_argument("--threads", type=int, default=4, help="Pages recognized at once")
+    args = parser.parse_args(argv)
+
+    if not TESSERACT_AVAILABLE:
+        print("Tesseract is not installed: nothing to measure")
+        return 1
+
+    if args.pdf:
+        pages = pdf_pages(args.pdf, args.dpi)
+    else:
+        pages = [synthetic_page(args.dpi, 0.0, seed) for seed in range(3)]
+    # Both backends get the same preprocessed images, as in OCRService
+    reference = OCRService(page_cache_entries=0)
+    images = [reference._preprocess_image(image, args.dpi) for image, _ in pages]
+    run(images, args.runs, args.threads)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -93,6 +93,11 @@ export interface KeywordsAnalysis {
   recommended: string[];
 }
 
+export interface OCRPageConfidence {
+  page: number;
+  confidence: number;
+}
+
 export interface AnalysisResult {
   success: boolean;
   candidate: CandidateInfo;
@@ -110,4 +115,7 @@ export interface AnalysisResult {
   // OCR metadata
   parsing_method: 'standard' | 'ocr' | 'ocr_unavailable';
   ocr_confidence: 'low' | 'medium' | 'high' | null;
+  ocr_tier?: 'fast' | 'mixed' | 'high' | null;
+  ocr_mean_confidence?: number | null;
+  ocr_page_confidences?: OCRPageConfidence[] | null;
 }